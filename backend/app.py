@@ -11,6 +11,7 @@ import string
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
+from scipy.sparse import vstack
 
 # Add the current directory to Python path
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -25,13 +26,20 @@ from flask import Flask, request, jsonify
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_cors import CORS
-from models import db, User, Article, SearchHistory
+from models import db, User, Article, SearchHistory, Topic
 from routes.auth import auth_bp
 from routes.search import search_bp
 from routes.article import article_bp
 from routes.user import user_bp
-from services.search_service import search_articles
-from nlp.summarizer import summarize_text
+from services.search_service import parse_filters, build_article_query, rank_articles
+from services.facet_index import get_facet_index
+from services.index_store import get_index
+from services.index_builder import tfidf_arrays, tfidf_transform
+from services.citation_service import citations_per_year
+from services.response_encoding import encode_response, compact_graph
+from services.ingest_service import ingest_papers
+from ml.topic_model import topic_summaries
+from nlp.keywords import extract_keywords
 from services.arxiv_service import fetch_arxiv_papers
 
 # Set up logging
@@ -43,12 +51,27 @@ CORS(app, resources={r"/*": {"origins": "http://localhost:3000"}}, supports_cred
 
 # Configuration
 basedir = os.path.abspath(os.path.dirname(__file__))
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + os.path.join(basedir, 'ml_mining_research.db')
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///' + os.path.join(basedir, 'ml_mining_research.db'))
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+app.config['ARXIV_PDF_BASE_URL'] = os.environ.get('ARXIV_PDF_BASE_URL', 'https://arxiv.org/pdf')
+app.config['FULLTEXT_DOWNLOAD_CONCURRENCY'] = int(os.environ.get('FULLTEXT_DOWNLOAD_CONCURRENCY', 8))
+app.config['FULLTEXT_EXTRACT_WORKERS'] = int(os.environ.get('FULLTEXT_EXTRACT_WORKERS', os.cpu_count() or 2))
+app.config['TOPIC_MODEL_DIR'] = os.environ.get('TOPIC_MODEL_DIR', os.path.join(basedir, 'topic_model'))
+app.config['NUM_TOPICS'] = int(os.environ.get('NUM_TOPICS', 10))
+app.config['INDEX_DIR'] = os.environ.get('INDEX_DIR', os.path.join(basedir, 'indexes'))
+# Backends: 'bart' or 'extractive', 'sentence-transformers' or 'hashing', 'arxiv' or 'fixture'
+app.config['SUMMARIZER_BACKEND'] = os.environ.get('SUMMARIZER_BACKEND', 'bart')
+app.config['EMBEDDER_BACKEND'] = os.environ.get('EMBEDDER_BACKEND', 'sentence-transformers')
+app.config['PAPER_SOURCE'] = os.environ.get('PAPER_SOURCE', 'arxiv')
+app.config['PAPER_FIXTURE_PATH'] = os.environ.get('PAPER_FIXTURE_PATH')
 
 # Initialize extensions
 db.init_app(app)
-migrate = Migrate(app, db)
+def include_object(object, name, type_, reflected, compare_to):
+    # The full-text index tables are managed by hand (services/fulltext_search.py), not by autogenerate
+    return not (type_ == 'table' and name.startswith('article_fts'))
+
+migrate = Migrate(app, db, include_object=include_object)
 
 # Register blueprints
 app.register_blueprint(auth_bp, url_prefix='/auth')
@@ -63,16 +86,11 @@ def handle_exception(e):
 
 @app.route('/search', methods=['POST'])
 def search_articles():
-    query = request.json.get('query', '')
-    
-    if query:
-        articles = Article.query.filter(
-            (Article.title.ilike(f'%{query}%')) |
-            (Article.abstract.ilike(f'%{query}%')) |
-            (Article.full_text.ilike(f'%{query}%'))
-        ).all()
-    else:
-        articles = Article.query.all()
+    data = request.json or {}
+    query = data.get('query', '')
+    filters = parse_filters(data.get('filters'))
+
+    articles = rank_articles(query, build_article_query(query, filters).all())
     
     logger.info(f"Search query: '{query}'. Found {len(articles)} articles.")
     
@@ -87,10 +105,16 @@ def search_articles():
             'abstract': article.abstract,
             'publicationDate': publication_date,
             'relevance': article.relevance or 0,
-            'arxiv_id': article.arxiv_id
+            'arxiv_id': article.arxiv_id,
+            'categories': article.categories.split() if article.categories else []
         })
     
-    return jsonify(articles_data)
+    if data.get('facets'):
+        article_ids = [article.id for article in articles]
+        facets = get_facet_index(article_ids).counts(article_ids)
+        return encode_response({'results': articles_data, 'facets': facets})
+
+    return encode_response(articles_data)
 
 @app.route('/trigger_arxiv_fetch', methods=['POST'])
 def trigger_arxiv_fetch():
@@ -98,29 +122,7 @@ def trigger_arxiv_fetch():
         logger.info("Starting arXiv fetch process")
         papers = fetch_arxiv_papers()
         logger.info(f"Fetched {len(papers)} papers from arXiv")
-        new_papers_count = 0
-        for paper in papers:
-            logger.debug(f"Processing paper: {paper['title']}")
-            existing_paper = Article.query.filter_by(arxiv_id=paper['arxiv_id']).first()
-            if not existing_paper:
-                new_paper = Article(
-                    title=paper['title'],
-                    authors=', '.join(paper['authors']),
-                    abstract=paper['abstract'],
-                    arxiv_id=paper['arxiv_id'],
-                    publication_date=paper['publication_date'],
-                    full_text=paper['full_text']
-                )
-                db.session.add(new_paper)
-                new_papers_count += 1
-                logger.debug(f"Added new paper: {new_paper.title}")
-                
-                summary = summarize_text(new_paper.full_text)
-                new_paper.summary = summary
-                logger.debug(f"Generated summary for paper: {new_paper.title}")
-        
-        logger.info(f"Committing {new_papers_count} new papers to database")
-        db.session.commit()
+        new_papers_count = len(ingest_papers(papers))
         total_papers = Article.query.count()
         logger.info(f"Added {new_papers_count} new papers. Total papers in database: {total_papers}")
         return jsonify({
@@ -133,6 +135,8 @@ def trigger_arxiv_fetch():
 
 from collections import defaultdict
 
+RECOMMENDATION_BLOCK_SIZE = 1000
+
 @app.route('/article/graph', methods=['GET'])
 def get_article_graph():
     articles = Article.query.all()
@@ -178,7 +182,11 @@ def get_article_graph():
         "nodes": nodes,
         "links": links
     }
-    return jsonify(graph_data)
+    if request.args.get('format') == 'compact':
+        for node in nodes:
+            node["authors"] = node["authors"].split(', ') if node["authors"] else []
+        graph_data = compact_graph(graph_data, string_fields=("label",), list_fields=("authors",))
+    return encode_response(graph_data)
 
 @app.route('/article/count', methods=['GET'])
 def get_article_count():
@@ -237,7 +245,7 @@ def populate_sample_data():
 
         # Add sample articles to the database
         for article_data in sample_articles:
-            article = Article(**article_data)
+            article = Article(arxiv_base_id=article_data['arxiv_id'], **article_data)
             db.session.add(article)
 
         db.session.commit()
@@ -280,17 +288,13 @@ def get_visualization_data():
                 month_key = article.publication_date.strftime('%Y-%m')
                 pub_per_month[month_key] += 1
         
-        # Research topics distribution
-        vectorizer = TfidfVectorizer(stop_words='english', max_features=5)
-        tfidf_matrix = vectorizer.fit_transform([article.abstract for article in articles if article.abstract])
-        feature_names = vectorizer.get_feature_names_out()
-        tfidf_sums = tfidf_matrix.sum(axis=0).A1
-        top_topics = [feature_names[i] for i in tfidf_sums.argsort()[-5:][::-1]]
-        topic_counts = [int(tfidf_sums[tfidf_sums.argsort()[-5:][i]]) for i in range(5)]
+        # Research topics distribution (stored topic model results, largest topics first)
+        topics = Topic.query.order_by(Topic.article_count.desc()).limit(5).all()
+        top_topics = [topic.label for topic in topics]
+        topic_counts = [topic.article_count for topic in topics]
         
-        # Citations over time (simulated data)
-        current_year = datetime.now().year
-        citations_over_time = {str(year): random.randint(50, 200) for year in range(current_year-5, current_year+1)}
+        # Citations over time, by year of the citing paper
+        citations_over_time = citations_per_year()
         
         # Collaboration network (simulated data)
         authors = set()
@@ -307,18 +311,18 @@ def get_visualization_data():
         
         collaboration_network = {"nodes": nodes, "links": links}
         
-        # Research Impact vs. Publication Year (simulated data)
+        # Research Impact vs. Publication Year
         research_impact = [
-            {"x": article.publication_date.year if article.publication_date else random.randint(current_year-10, current_year), 
-             "y": random.uniform(0, 10)}  # Impact factor between 0 and 10
-            for article in articles
+            {"x": article.publication_date.year, "y": article.citation_count or 0}
+            for article in articles if article.publication_date
         ]
         
-        # Top Authors by Citation Count (simulated data)
+        # Top Authors by Citation Count
         author_citations = defaultdict(int)
         for article in articles:
-            for author in article.authors.split(', '):
-                author_citations[author] += random.randint(0, 100)  # Random citation count
+            if article.citation_count:
+                for author in article.authors.split(', '):
+                    author_citations[author] += article.citation_count
         
         top_authors = sorted(author_citations.items(), key=lambda x: x[1], reverse=True)[:10]
         top_authors_data = [{"name": author, "citations": citations} for author, citations in top_authors]
@@ -340,12 +344,10 @@ def get_ai_insights():
     try:
         articles = Article.query.all()
         
-        # Trending topics
-        vectorizer = TfidfVectorizer(stop_words='english', ngram_range=(1,2), max_features=100)
-        tfidf_matrix = vectorizer.fit_transform([article.abstract for article in articles if article.abstract])
-        feature_names = vectorizer.get_feature_names_out()
-        tfidf_sums = tfidf_matrix.sum(axis=0).A1
-        trending_topics = [feature_names[i] for i in tfidf_sums.argsort()[-3:][::-1]]
+        # Trending topics: largest growth in monthly prevalence according to the topic model
+        trending_topics = [topic.label for topic in Topic.query.order_by(Topic.trend.desc()).limit(3).all()]
+        if not trending_topics:
+            return jsonify({"error": "Topic model has not been trained yet"}), 503
         
         # Collaboration opportunities (simulated)
         collaborations = [
@@ -355,6 +357,7 @@ def get_ai_insights():
         
         # Emerging fields (based on recent papers)
         recent_papers = sorted(articles, key=lambda x: x.publication_date or datetime.min, reverse=True)[:10]
+        recent_papers.sort(key=lambda x: x.relevance or 0, reverse=True)
         emerging_fields = [article.title.split(':')[0] for article in recent_papers[:2]]
         
         # Research gaps (simulated)
@@ -375,50 +378,79 @@ def get_ai_insights():
         logger.exception("An error occurred while generating AI insights: %s", str(e))
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/topics', methods=['GET'])
+def get_topics():
+    try:
+        # Only reads precomputed results; training happens offline in train_topics.py
+        return jsonify(topic_summaries()), 200
+    except Exception as e:
+        logger.exception("An error occurred while fetching topics: %s", str(e))
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/api/recommendations', methods=['GET'])
 def get_recommendations():
     try:
-        # Get all articles
-        articles = Article.query.all()
+        articles_by_id = {
+            article.id: article for article in Article.query.filter(Article.duplicate_of_id.is_(None)).all()
+        }
         
-        if len(articles) < 2:
+        if len(articles_by_id) < 2:
             return jsonify({"message": "Not enough articles for recommendations"}), 200
 
-        # Create a TF-IDF vectorizer
-        vectorizer = TfidfVectorizer(stop_words='english')
-        
-        # Fit and transform the articles' abstracts
-        tfidf_matrix = vectorizer.fit_transform([article.abstract for article in articles if article.abstract])
-        
-        # Compute cosine similarity
-        cosine_similarities = cosine_similarity(tfidf_matrix, tfidf_matrix)
+        # Use the shared memory-mapped TF-IDF index; fit in-process only if none was published yet
+        index = get_index('tfidf')
+        if index is not None:
+            article_ids = index.array('ids')
+            tfidf_matrix = index.sparse('matrix')
+            # Articles ingested since the index was built are vectorized against its vocabulary
+            missing_ids = sorted(set(articles_by_id) - set(article_ids.tolist()))
+            if missing_ids:
+                missing_matrix = tfidf_transform(
+                    [articles_by_id[article_id].abstract or '' for article_id in missing_ids],
+                    index.array('terms'), index.array('idf')
+                )
+                article_ids = np.concatenate([article_ids, np.array(missing_ids, dtype=np.int64)])
+                tfidf_matrix = vstack([tfidf_matrix, missing_matrix], format='csr')
+        else:
+            article_ids = np.array(sorted(articles_by_id), dtype=np.int64)
+            tfidf_matrix, _, _ = tfidf_arrays([articles_by_id[article_id].abstract or '' for article_id in article_ids])
         
-        # Get top 5 recommendations for each article
+        # Get top 5 recommendations for each article, computing similarities a block of rows at a time
         recommendations = []
-        for i, article in enumerate(articles):
-            similar_indices = cosine_similarities[i].argsort()[:-6:-1]  # Top 5 similar articles (excluding itself)
-            similar_articles = [articles[index] for index in similar_indices if index != i]
-            
-            article_recommendations = []
-            for similar_article in similar_articles:
-                article_recommendations.append({
-                    'id': similar_article.id,
-                    'title': similar_article.title,
-                    'authors': similar_article.authors.split(', '),
-                    'abstract': similar_article.abstract[:200] + '...' if similar_article.abstract else '',
-                    'publicationDate': similar_article.publication_date.isoformat() if similar_article.publication_date else None,
-                    'similarity': float(cosine_similarities[i][similar_indices[similar_articles.index(similar_article)]])
+        for start in range(0, len(article_ids), RECOMMENDATION_BLOCK_SIZE):
+            block = (tfidf_matrix[start:start + RECOMMENDATION_BLOCK_SIZE] @ tfidf_matrix.T).toarray()
+            for offset, cosine_similarities in enumerate(block):
+                i = start + offset
+                article = articles_by_id.get(int(article_ids[i]))
+                if article is None:
+                    continue
+                cosine_similarities[i] = -1  # exclude itself
+                similar_indices = np.argpartition(-cosine_similarities, min(5, len(article_ids) - 1))[:5]
+                similar_indices = similar_indices[np.argsort(-cosine_similarities[similar_indices])]
+                
+                article_recommendations = []
+                for index_position in similar_indices:
+                    similar_article = articles_by_id.get(int(article_ids[index_position]))
+                    if similar_article is None or index_position == i:
+                        continue
+                    article_recommendations.append({
+                        'id': similar_article.id,
+                        'title': similar_article.title,
+                        'authors': similar_article.authors.split(', '),
+                        'abstract': similar_article.abstract[:200] + '...' if similar_article.abstract else '',
+                        'publicationDate': similar_article.publication_date.isoformat() if similar_article.publication_date else None,
+                        'similarity': float(cosine_similarities[index_position])
+                    })
+                
+                recommendations.append({
+                    'article': {
+                        'id': article.id,
+                        'title': article.title
+                    },
+                    'recommendations': article_recommendations
                 })
-            
-            recommendations.append({
-                'article': {
-                    'id': article.id,
-                    'title': article.title
-                },
-                'recommendations': article_recommendations
-            })
         
-        return jsonify(recommendations), 200
+        return encode_response(recommendations)
     except Exception as e:
         logger.exception("An error occurred while generating recommendations: %s", str(e))
         return jsonify({"error": str(e)}), 500
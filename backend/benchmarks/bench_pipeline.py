@@ -0,0 +1,89 @@
+"""Run ingest -> index -> search -> recommend end to end without network access.
+
+Uses the fixture paper source, the extractive summarizer and the hashing
+embedder on a synthetic corpus in a temporary database, so timings are
+reproducible on any CPU-only machine.
+
+    python benchmarks/bench_pipeline.py --papers 5000 --batch-size 500
+"""
+import os
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import statistics
+from synthetic_corpus import synthetic_papers, write_paper_fixture, load_offline_app
+
+QUERIES = ['ore grade prediction', 'flotation', 'deep neural network', 'copper leaching uncertainty', '']
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+def median_ms(function, repeats):
+    return statistics.median(timed(function)[1] for _ in range(repeats)) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--papers', type=int, default=2000)
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix='pipeline-bench-')
+    fixture_path = os.path.join(tmp_dir, 'papers.jsonl')
+    write_paper_fixture(fixture_path, synthetic_papers(random.Random(args.seed), args.papers))
+
+    app = load_offline_app(tmp_dir, fixture_path)
+    from app import fetch_arxiv_papers
+    from models import db, Article
+    from services.ingest_service import ingest_papers
+    from services.index_builder import build_indexes
+    from ml.recommendation import content_based_recommendations
+
+    client = app.test_client()
+    with app.app_context():
+        db.create_all()
+
+        papers, fetch_seconds = timed(fetch_arxiv_papers)
+
+        ingest_seconds = 0.0
+        for start in range(0, len(papers), args.batch_size):
+            _, seconds = timed(ingest_papers, papers[start:start + args.batch_size])
+            ingest_seconds += seconds
+
+        _, index_seconds = timed(build_indexes)
+
+        search_ms = {
+            query or '(empty)': median_ms(lambda: client.post('/search', json={'query': query}), args.repeats)
+            for query in QUERIES
+        }
+
+        _, recommendations_seconds = timed(client.get, '/api/recommendations')
+
+        articles = [
+            {'id': article.id, 'abstract': article.abstract}
+            for article in Article.query.with_entities(Article.id, Article.abstract).all()
+        ]
+        favorites = articles[:10]
+        content_ms = median_ms(lambda: content_based_recommendations(favorites, articles), args.repeats)
+
+        print(f"backends: summarizer={app.config['SUMMARIZER_BACKEND']} embedder={app.config['EMBEDDER_BACKEND']} "
+              f"source={app.config['PAPER_SOURCE']}")
+        print(f"{Article.query.count()} articles stored from {len(papers)} fixture papers")
+        print(f"{'fetch (s)':<44}{fetch_seconds:>10.2f}")
+        print(f"{'ingest (s)':<44}{ingest_seconds:>10.2f}   {len(papers) / ingest_seconds:,.0f} papers/s")
+        print(f"{'build indexes (s)':<44}{index_seconds:>10.2f}")
+        for query, ms in search_ms.items():
+            print(f"{'search ' + repr(query) + ' (ms)':<44}{ms:>10.1f}")
+        print(f"{'/api/recommendations (s)':<44}{recommendations_seconds:>10.2f}")
+        print(f"{'content-based, 10 favorites (ms)':<44}{content_ms:>10.1f}")
+
+        db.engine.dispose()
+    shutil.rmtree(tmp_dir)
+
+if __name__ == '__main__':
+    main()
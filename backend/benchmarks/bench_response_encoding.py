@@ -0,0 +1,98 @@
+"""Compare response encodings for the largest JSON endpoints.
+
+Ingests a synthetic corpus into a temporary database with the offline
+backends, then calls /article/graph, /api/recommendations and an empty-query
+/search through the app. For every endpoint it reports bytes on the wire and
+request time for each negotiated encoding, and the serialization time of the
+endpoint's payload against the old jsonify output.
+
+    python benchmarks/bench_response_encoding.py --articles 500
+"""
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import statistics
+from synthetic_corpus import synthetic_papers, load_offline_app
+
+ENDPOINTS = {
+    '/article/graph': ('GET', '/article/graph', None),
+    '/article/graph?format=compact': ('GET', '/article/graph?format=compact', None),
+    '/api/recommendations': ('GET', '/api/recommendations', None),
+    '/search (empty query)': ('POST', '/search', {'query': ''})
+}
+
+NEGOTIATIONS = {
+    'json': {'Accept': 'application/json'},
+    'json + gzip': {'Accept': 'application/json', 'Accept-Encoding': 'gzip'},
+    'json + br': {'Accept': 'application/json', 'Accept-Encoding': 'br, gzip'},
+    'msgpack': {'Accept': 'application/msgpack'},
+    'msgpack + br': {'Accept': 'application/msgpack', 'Accept-Encoding': 'br, gzip'}
+}
+
+def jsonify_dumps(payload):
+    # What Flask's default JSON provider emits outside debug mode
+    return json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+def median_ms(function, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - start)
+    return result, statistics.median(timings) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--articles', type=int, default=500)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix='encoding-bench-')
+    app = load_offline_app(tmp_dir)
+    from dateutil.parser import parse
+    from models import db
+    from services import response_encoding
+    from services.ingest_service import ingest_papers
+    from services.index_builder import build_indexes
+
+    papers = synthetic_papers(random.Random(args.seed), args.articles)
+    for paper in papers:
+        paper['publication_date'] = parse(paper['publication_date'])
+
+    client = app.test_client()
+    with app.app_context():
+        db.create_all()
+        ingest_papers(papers)
+        build_indexes(['tfidf', 'bm25'])
+
+        serializers = {'jsonify (old)': jsonify_dumps, 'json': response_encoding.dumps_json}
+        if response_encoding.msgpack is not None:
+            serializers['msgpack'] = response_encoding.dumps_msgpack
+
+        print(f"{args.articles} articles, json encoder: "
+              f"{'orjson' if response_encoding.orjson is not None else 'stdlib json'}")
+        for endpoint, (method, path, body) in ENDPOINTS.items():
+            def request(headers):
+                return client.open(path, method=method, json=body, headers=headers)
+
+            payload = request({'Accept': 'application/json'}).get_json()
+            print(f"\n{endpoint}")
+            print(f"  {'serializer':<24}{'bytes':>14}{'ms':>10}")
+            for name, serializer in serializers.items():
+                encoded, ms = median_ms(lambda: serializer(payload), args.repeats)
+                print(f"  {name:<24}{len(encoded):>14,}{ms:>10.1f}")
+
+            print(f"  {'request':<24}{'bytes on wire':>14}{'ms':>10}")
+            for name, headers in NEGOTIATIONS.items():
+                response, ms = median_ms(lambda: request(headers), args.repeats)
+                print(f"  {name:<24}{len(response.data):>14,}{ms:>10.1f}")
+
+        db.engine.dispose()
+    shutil.rmtree(tmp_dir)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""Compare inline text columns with compressed text_blob storage.
+
+Builds two SQLite databases with the same synthetic corpus, one with full_text
+and summary stored inline on article (the old schema) and one with them moved
+to text_blob, then reports file size and list-query latency for both.
+
+    python benchmarks/bench_text_storage.py --articles 5000 --full-text-words 6000
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import statistics
+import sqlalchemy as sa
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.text_store import encode_text
+from synthetic_corpus import synthetic_text
+
+LIST_COLUMNS = "id, title, authors, abstract, publication_date, arxiv_id, relevance, is_favorite"
+
+def create_inline_db(path, corpus):
+    engine = sa.create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE TABLE article (id INTEGER PRIMARY KEY, title VARCHAR(255), authors TEXT, "
+            "abstract TEXT, full_text TEXT, summary TEXT, publication_date DATETIME, "
+            "arxiv_id VARCHAR(50), relevance FLOAT, is_favorite BOOLEAN)"
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO article (id, title, authors, abstract, full_text, summary, publication_date, arxiv_id) "
+            "VALUES (?, ?, ?, ?, ?, ?, '2024-01-01', ?)",
+            [(a['id'], a['title'], a['authors'], a['abstract'], a['full_text'], a['summary'], a['arxiv_id'])
+             for a in corpus]
+        )
+    return engine
+
+def create_blob_db(path, corpus):
+    engine = sa.create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE TABLE text_blob (content_hash VARCHAR(64) PRIMARY KEY, codec VARCHAR(16), "
+            "data BLOB, size INTEGER, created_at DATETIME)"
+        )
+        conn.exec_driver_sql(
+            "CREATE TABLE article (id INTEGER PRIMARY KEY, title VARCHAR(255), authors TEXT, "
+            "abstract TEXT, full_text_hash VARCHAR(64), summary_hash VARCHAR(64), publication_date DATETIME, "
+            "arxiv_id VARCHAR(50), relevance FLOAT, is_favorite BOOLEAN)"
+        )
+        for a in corpus:
+            full_text = encode_text(a['full_text'])
+            summary = encode_text(a['summary'])
+            for blob in (full_text, summary):
+                conn.exec_driver_sql(
+                    "INSERT OR IGNORE INTO text_blob (content_hash, codec, data, size) VALUES (?, ?, ?, ?)",
+                    (blob['content_hash'], blob['codec'], blob['data'], blob['size'])
+                )
+            conn.exec_driver_sql(
+                "INSERT INTO article (id, title, authors, abstract, full_text_hash, summary_hash, publication_date, arxiv_id) "
+                "VALUES (?, ?, ?, ?, ?, ?, '2024-01-01', ?)",
+                (a['id'], a['title'], a['authors'], a['abstract'],
+                 full_text['content_hash'], summary['content_hash'], a['arxiv_id'])
+            )
+    return engine
+
+def time_query(engine, sql, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        with engine.connect() as conn:
+            conn.exec_driver_sql(sql).fetchall()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--articles', type=int, default=2000)
+    parser.add_argument('--full-text-words', type=int, default=5000)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = [
+        {
+            'id': i + 1,
+            'title': synthetic_text(rng, 10, number_every=17),
+            'authors': 'Jane Doe, John Smith',
+            'abstract': synthetic_text(rng, 180, number_every=17),
+            'full_text': synthetic_text(rng, args.full_text_words, number_every=17),
+            'summary': synthetic_text(rng, 120, number_every=17),
+            'arxiv_id': f"2401.{i:05d}"
+        }
+        for i in range(args.articles)
+    ]
+
+    # The old list views loaded whole rows; the new ones only touch article columns
+    queries = {
+        'list all': ("SELECT * FROM article", f"SELECT {LIST_COLUMNS} FROM article"),
+        'page of 50': ("SELECT * FROM article ORDER BY publication_date DESC LIMIT 50",
+                       f"SELECT {LIST_COLUMNS} FROM article ORDER BY publication_date DESC LIMIT 50"),
+        'title scan': ("SELECT id FROM article WHERE title LIKE '%mineral%'",
+                       "SELECT id FROM article WHERE title LIKE '%mineral%'")
+    }
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        inline_path = os.path.join(tmp_dir, 'inline.db')
+        blob_path = os.path.join(tmp_dir, 'blob.db')
+        inline = create_inline_db(inline_path, corpus)
+        blob = create_blob_db(blob_path, corpus)
+
+        print(f"{args.articles} articles, ~{args.full_text_words} words of full text each")
+        print(f"{'':<14}{'inline':>14}{'text_blob':>14}")
+        print(f"{'db size (MB)':<14}{os.path.getsize(inline_path) / 1e6:>14.2f}{os.path.getsize(blob_path) / 1e6:>14.2f}")
+        for name, (inline_sql, blob_sql) in queries.items():
+            print(f"{name + ' (ms)':<14}"
+                  f"{time_query(inline, inline_sql, args.repeats):>14.2f}"
+                  f"{time_query(blob, blob_sql, args.repeats):>14.2f}")
+
+        inline.dispose()
+        blob.dispose()
+
+if __name__ == '__main__':
+    main()
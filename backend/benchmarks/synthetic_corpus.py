@@ -0,0 +1,73 @@
+"""Synthetic papers and an offline app instance shared by the benchmarks."""
+import os
+import sys
+import json
+import logging
+
+DOMAIN_WORDS = (
+    "model data learning mining ore grade neural network training sensor process "
+    "flotation metallurgy prediction regression feature dataset accuracy results "
+    "method approach deep convolutional analysis mineral exploration drilling "
+    "copper gold iron leaching grinding comminution haulage blasting geology assay "
+    "spectral imaging reinforcement transformer graph bayesian uncertainty forecasting"
+).split()
+
+FUNCTION_WORDS = "the of and in to for with on is are we this that by from as an be".split()
+
+VOCABULARY = DOMAIN_WORDS + FUNCTION_WORDS
+
+AUTHORS = [f"{first} {last}" for first in ("Jane", "John", "Wei", "Maria", "Ahmed", "Olga", "Kenji", "Ana")
+           for last in ("Doe", "Smith", "Zhang", "Garcia", "Khan", "Ivanova", "Sato", "Silva")]
+
+CATEGORIES = ['cs.LG', 'cs.AI', 'stat.ML', 'physics.geo-ph', 'cs.CV', 'eess.SP']
+
+def synthetic_text(rng, n_words, number_every=None):
+    words = [rng.choice(VOCABULARY) for _ in range(n_words)]
+    # Numbers keep the text from being unrealistically compressible
+    if number_every:
+        for i in range(0, n_words, number_every):
+            words[i] = f"{rng.random():.4f}"
+    return ' '.join(words)
+
+def synthetic_sentence(rng):
+    return synthetic_text(rng, rng.randint(8, 20)).capitalize() + '.'
+
+def synthetic_papers(rng, n_papers):
+    """Papers in the format fetch_arxiv_papers returns, with ISO date strings."""
+    return [
+        {
+            'title': ' '.join(rng.choice(DOMAIN_WORDS) for _ in range(8)).title() + f" {i}",
+            'authors': rng.sample(AUTHORS, rng.randint(1, 5)),
+            'abstract': ' '.join(synthetic_sentence(rng) for _ in range(rng.randint(5, 10))),
+            'arxiv_id': f"24{i // 100000 + 1:02d}.{i % 100000:05d}v1",
+            'publication_date': f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T00:00:00+00:00",
+            'categories': rng.sample(CATEGORIES, 2)
+        }
+        for i in range(n_papers)
+    ]
+
+def write_paper_fixture(path, papers):
+    with open(path, 'w', encoding='utf-8') as f:
+        for paper in papers:
+            f.write(json.dumps(paper) + '\n')
+
+def load_offline_app(tmp_dir, fixture_path=None):
+    """Import the app configured with the local backends and a database in tmp_dir."""
+    # Everything the app reads at import time has to be in place before importing it
+    os.environ.update({
+        'OFFLINE': '1',
+        'HF_HUB_OFFLINE': '1',
+        'DATABASE_URL': 'sqlite:///' + os.path.join(tmp_dir, 'bench.db'),
+        'INDEX_DIR': os.path.join(tmp_dir, 'indexes'),
+        'TOPIC_MODEL_DIR': os.path.join(tmp_dir, 'topic_model'),
+        'ARXIV_PDF_BASE_URL': '',
+        'SUMMARIZER_BACKEND': 'extractive',
+        'EMBEDDER_BACKEND': 'hashing',
+        'PAPER_SOURCE': 'fixture',
+        'PAPER_FIXTURE_PATH': fixture_path or ''
+    })
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    from app import app
+    logging.getLogger().setLevel(logging.WARNING)
+    return app
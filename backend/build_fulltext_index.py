@@ -0,0 +1,10 @@
+from app import app
+from services.fulltext_search import index_existing_articles
+
+def build_fulltext_index():
+    with app.app_context():
+        count = index_existing_articles()
+        print(f"Indexed full text for {count} articles.")
+
+if __name__ == "__main__":
+    build_fulltext_index()
@@ -0,0 +1,18 @@
+import argparse
+from app import app
+from services.index_builder import BUILDERS, build_indexes as build
+
+def build_indexes(names=None):
+    with app.app_context():
+        versions = build(names)
+        for name, version in versions.items():
+            print(f"Published {name} index version {version}.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the memory-mapped search and recommendation indexes.")
+    parser.add_argument('names', nargs='*', help=f"Indexes to build: {', '.join(sorted(BUILDERS))} (default: all)")
+    args = parser.parse_args()
+    unknown = set(args.names) - set(BUILDERS)
+    if unknown:
+        parser.error(f"unknown index: {', '.join(sorted(unknown))}")
+    build_indexes(args.names or None)
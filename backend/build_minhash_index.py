@@ -0,0 +1,10 @@
+from app import app
+from services.dedupe_service import index_existing_articles
+
+def build_minhash_index():
+    with app.app_context():
+        count = index_existing_articles()
+        print(f"Indexed MinHash signatures for {count} articles.")
+
+if __name__ == "__main__":
+    build_minhash_index()
@@ -0,0 +1,184 @@
+"""Stream the article corpus in and out as JSONL (optionally gzipped) or Parquet.
+
+    python bulk_io.py import arxiv-metadata-oai-snapshot.json --chunk-size 5000
+    python bulk_io.py export articles.jsonl.gz
+
+Import accepts this app's export format as well as the arXiv metadata snapshot
+format, skips papers whose arXiv id is already stored and leaves summaries,
+LSH signatures, topics and search indexes to be built afterwards.
+"""
+import gzip
+import json
+import time
+import argparse
+from itertools import islice
+from dateutil.parser import parse
+from app import app, db
+from models import Article
+from services.dedupe_service import split_arxiv_version
+
+DEFAULT_CHUNK_SIZE = 5000
+MAX_TITLE_LENGTH = 255
+
+EXPORT_COLUMNS = (
+    Article.id, Article.arxiv_id, Article.title, Article.authors, Article.abstract,
+    Article.publication_date, Article.categories, Article.relevance, Article.citation_count
+)
+
+def _is_parquet(path):
+    return path.endswith('.parquet')
+
+def _open_text(path, mode):
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+def read_records(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    if _is_parquet(path):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield from batch.to_pylist()
+        return
+
+    with _open_text(path, 'r') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def _authors(record):
+    if record.get('authors_parsed'):
+        # arXiv snapshot: [[last, first, suffix], ...]
+        return ', '.join(' '.join(part for part in (first, last) if part) for last, first, *_ in record['authors_parsed'])
+    authors = record.get('authors') or ''
+    return ', '.join(authors) if isinstance(authors, list) else ' '.join(authors.split())
+
+def _publication_date(record):
+    if record.get('publication_date'):
+        return parse(record['publication_date']).replace(tzinfo=None)
+    if record.get('versions'):
+        return parse(record['versions'][0]['created']).replace(tzinfo=None)
+    if record.get('update_date'):
+        return parse(record['update_date'])
+    return None
+
+def normalize_record(record):
+    arxiv_id = record.get('arxiv_id') or record['id']
+    if record.get('versions') and 'v' not in arxiv_id.split('/')[-1]:
+        arxiv_id = f"{arxiv_id}{record['versions'][-1]['version']}"
+    base_id, version = split_arxiv_version(arxiv_id)
+    categories = record.get('categories') or ''
+    return {
+        'arxiv_id': arxiv_id,
+        'arxiv_base_id': base_id,
+        'arxiv_version': version,
+        'title': ' '.join((record.get('title') or '').split())[:MAX_TITLE_LENGTH],
+        'authors': _authors(record),
+        'abstract': ' '.join((record.get('abstract') or '').split()),
+        'publication_date': _publication_date(record),
+        'categories': ' '.join(categories) if isinstance(categories, list) else categories,
+        'is_favorite': False
+    }
+
+def import_articles(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    records = read_records(path, chunk_size)
+    imported = skipped = 0
+    start = time.monotonic()
+
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            break
+
+        rows = {}
+        for record in chunk:
+            row = normalize_record(record)
+            rows.setdefault(row['arxiv_base_id'], row)
+
+        existing = {
+            base_id for (base_id,) in
+            db.session.query(Article.arxiv_base_id).filter(Article.arxiv_base_id.in_(list(rows))).all()
+        }
+        new_rows = [row for base_id, row in rows.items() if base_id not in existing]
+        if new_rows:
+            # Core executemany insert: no ORM objects, one round trip per chunk
+            db.session.execute(db.insert(Article), new_rows)
+        db.session.commit()
+
+        imported += len(new_rows)
+        skipped += len(chunk) - len(new_rows)
+        print(f"\rImported {imported} articles, skipped {skipped} ({imported / (time.monotonic() - start):.0f}/s)", end='', flush=True)
+
+    print()
+    return imported, skipped
+
+def _export_record(row):
+    return {
+        'id': row.id,
+        'arxiv_id': row.arxiv_id,
+        'title': row.title,
+        'authors': row.authors.split(', ') if row.authors else [],
+        'abstract': row.abstract,
+        'publication_date': row.publication_date.isoformat() if row.publication_date else None,
+        'categories': row.categories.split() if row.categories else [],
+        'relevance': row.relevance,
+        'citation_count': row.citation_count
+    }
+
+def export_articles(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    # yield_per streams from a server-side cursor where the driver supports it
+    result = db.session.execute(
+        db.select(*EXPORT_COLUMNS)
+        .where(Article.duplicate_of_id.is_(None))
+        .order_by(Article.id)
+        .execution_options(yield_per=chunk_size)
+    )
+
+    exported = 0
+    if _is_parquet(path):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        writer = None
+        try:
+            for rows in result.partitions():
+                table = pa.Table.from_pylist([_export_record(row) for row in rows])
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+                exported += len(rows)
+        finally:
+            if writer is not None:
+                writer.close()
+        return exported
+
+    with _open_text(path, 'w') as f:
+        for rows in result.partitions():
+            for row in rows:
+                f.write(json.dumps(_export_record(row)) + '\n')
+            exported += len(rows)
+    return exported
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('command', choices=['import', 'export'])
+    parser.add_argument('path', help=".jsonl, .jsonl.gz or .parquet file")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--build-indexes', action='store_true',
+                        help="After importing, build MinHash signatures and the search indexes")
+    args = parser.parse_args()
+
+    with app.app_context():
+        if args.command == 'import':
+            imported, skipped = import_articles(args.path, args.chunk_size)
+            print(f"Imported {imported} articles ({skipped} already present) from {args.path}.")
+            if args.build_indexes:
+                from services.dedupe_service import index_existing_articles
+                from services.index_builder import build_indexes
+                index_existing_articles()
+                build_indexes(['tfidf', 'bm25'])
+                print("Built MinHash signatures and search indexes.")
+        else:
+            exported = export_articles(args.path, args.chunk_size)
+            print(f"Exported {exported} articles to {args.path}.")
+
+if __name__ == "__main__":
+    main()
@@ -13,11 +13,19 @@ def download_nltk_data():
     # Add the custom directory to NLTK's data path
     nltk.data.path.append(nltk_data_dir)
 
-    # Download required NLTK data
-    nltk.download('stopwords', download_dir=nltk_data_dir, quiet=False)
-    nltk.download('punkt', download_dir=nltk_data_dir, quiet=False)
+    # Download required NLTK data that isn't available yet; with OFFLINE set
+    # nothing is downloaded and missing data only fails when it's first used
+    offline = os.environ.get('OFFLINE', '').lower() in ('1', 'true', 'yes')
+    for resource, package in (('corpora/stopwords', 'stopwords'), ('tokenizers/punkt', 'punkt')):
+        try:
+            nltk.data.find(resource)
+        except LookupError:
+            if offline:
+                print(f"NLTK data '{package}' is missing and OFFLINE is set, not downloading it")
+                continue
+            nltk.download(package, download_dir=nltk_data_dir, quiet=False)
 
-    print(f"NLTK data downloaded successfully to {nltk_data_dir}")
+    print(f"NLTK data available in {nltk_data_dir}")
     print(f"NLTK data path: {nltk.data.path}")
 
 if __name__ == "__main__":
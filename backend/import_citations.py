@@ -0,0 +1,17 @@
+import sys
+from app import app, db
+from services.citation_service import load_reference_fixture, add_citations_by_arxiv_id, update_citation_scores
+
+def import_citations(path):
+    with app.app_context():
+        count = add_citations_by_arxiv_id(load_reference_fixture(path))
+        db.session.flush()
+        update_citation_scores()
+        db.session.commit()
+        print(f"Imported {count} citations from {path}.")
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python import_citations.py references.jsonl")
+        sys.exit(1)
+    import_citations(sys.argv[1])
@@ -0,0 +1,125 @@
+"""Move article full_text and summary into compressed text_blob rows
+
+Revision ID: 40c0e386be18
+Revises: eca57e141c2e
+Create Date: 2026-10-19 13:05:52.730941
+
+"""
+import hashlib
+import zlib
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '40c0e386be18'
+down_revision = 'eca57e141c2e'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+
+text_blob = sa.table('text_blob',
+    sa.column('content_hash', sa.String),
+    sa.column('codec', sa.String),
+    sa.column('data', sa.LargeBinary),
+    sa.column('size', sa.Integer),
+    sa.column('created_at', sa.DateTime)
+)
+
+
+def _article_table(*columns):
+    return sa.table('article', sa.column('id', sa.Integer), *columns)
+
+
+def upgrade():
+    with op.batch_alter_table('article', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('summary_hash', sa.String(length=64), nullable=True))
+        batch_op.create_foreign_key('fk_article_summary_hash', 'text_blob', ['summary_hash'], ['content_hash'])
+
+    # Compress existing rows. zlib is used so the migration has no optional dependencies;
+    # readers pick the codec per row.
+    bind = op.get_bind()
+    article = _article_table(
+        sa.column('full_text', sa.Text),
+        sa.column('summary', sa.Text),
+        sa.column('full_text_hash', sa.String),
+        sa.column('summary_hash', sa.String)
+    )
+    existing = {row[0] for row in bind.execute(sa.select(text_blob.c.content_hash))}
+
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(article.c.id, article.c.full_text, article.c.summary, article.c.full_text_hash)
+            .where(article.c.id > last_id)
+            .order_by(article.c.id)
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+
+        for row in rows:
+            values = {}
+            # Rows ingested with a PDF already point at their extracted text
+            if row.full_text and not row.full_text_hash:
+                values['full_text_hash'] = _insert_blob(bind, existing, row.full_text)
+            if row.summary:
+                values['summary_hash'] = _insert_blob(bind, existing, row.summary)
+            if values:
+                bind.execute(article.update().where(article.c.id == row.id).values(**values))
+        last_id = rows[-1].id
+
+    with op.batch_alter_table('article', schema=None) as batch_op:
+        batch_op.drop_column('full_text')
+        batch_op.drop_column('summary')
+
+
+def _insert_blob(bind, existing, text):
+    content_hash = hashlib.sha256(text.encode('utf-8')).hexdigest()
+    if content_hash not in existing:
+        bind.execute(text_blob.insert().values(
+            content_hash=content_hash,
+            codec='zlib',
+            data=zlib.compress(text.encode('utf-8'), 6),
+            size=len(text),
+            created_at=datetime.utcnow()
+        ))
+        existing.add(content_hash)
+    return content_hash
+
+
+def downgrade():
+    with op.batch_alter_table('article', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('full_text', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('summary', sa.Text(), nullable=True))
+
+    bind = op.get_bind()
+    article = _article_table(
+        sa.column('full_text', sa.Text),
+        sa.column('summary', sa.Text),
+        sa.column('full_text_hash', sa.String),
+        sa.column('summary_hash', sa.String)
+    )
+    blobs = text_blob.alias()
+    rows = bind.execute(sa.select(article.c.id, article.c.full_text_hash, article.c.summary_hash)).fetchall()
+    for row in rows:
+        values = {}
+        for column, content_hash in (('full_text', row.full_text_hash), ('summary', row.summary_hash)):
+            if not content_hash:
+                continue
+            blob = bind.execute(
+                sa.select(blobs.c.codec, blobs.c.data).where(blobs.c.content_hash == content_hash)
+            ).first()
+            if blob is None:
+                continue
+            if blob.codec != 'zlib':
+                raise RuntimeError(f"Cannot downgrade {blob.codec}-compressed text without its codec")
+            values[column] = zlib.decompress(blob.data).decode('utf-8')
+        if values:
+            bind.execute(article.update().where(article.c.id == row.id).values(**values))
+
+    with op.batch_alter_table('article', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_article_summary_hash', type_='foreignkey')
+        batch_op.drop_column('summary_hash')
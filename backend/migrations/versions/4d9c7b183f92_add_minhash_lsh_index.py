@@ -0,0 +1,72 @@
+"""Add arXiv version tracking and MinHash LSH index
+
+Revision ID: 4d9c7b183f92
+Revises: 40c0e386be18
+Create Date: 2026-10-19 15:22:10.504386
+
+"""
+import re
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4d9c7b183f92'
+down_revision = '40c0e386be18'
+branch_labels = None
+depends_on = None
+
+ARXIV_VERSION = re.compile(r'^(?P<base>.+?)(?:v(?P<version>\d+))?$')
+
+
+def upgrade():
+    op.create_table('min_hash_signature',
+    sa.Column('article_id', sa.Integer(), nullable=False),
+    sa.Column('signature', sa.LargeBinary(), nullable=False),
+    sa.ForeignKeyConstraint(['article_id'], ['article.id'], ),
+    sa.PrimaryKeyConstraint('article_id')
+    )
+    op.create_table('min_hash_band',
+    sa.Column('band', sa.SmallInteger(), nullable=False),
+    sa.Column('bucket', sa.BigInteger(), nullable=False),
+    sa.Column('article_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['article_id'], ['article.id'], ),
+    sa.PrimaryKeyConstraint('band', 'bucket', 'article_id')
+    )
+    with op.batch_alter_table('article', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('arxiv_base_id', sa.String(length=50), nullable=True))
+        batch_op.add_column(sa.Column('arxiv_version', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('duplicate_of_id', sa.Integer(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_article_arxiv_base_id'), ['arxiv_base_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_article_duplicate_of_id'), ['duplicate_of_id'], unique=False)
+        batch_op.create_foreign_key('fk_article_duplicate_of_id', 'article', ['duplicate_of_id'], ['id'])
+
+    # Split existing ids into base id and version; signatures are backfilled by build_minhash_index.py
+    bind = op.get_bind()
+    article = sa.table('article',
+        sa.column('id', sa.Integer),
+        sa.column('arxiv_id', sa.String),
+        sa.column('arxiv_base_id', sa.String),
+        sa.column('arxiv_version', sa.Integer)
+    )
+    rows = bind.execute(sa.select(article.c.id, article.c.arxiv_id).where(article.c.arxiv_id.isnot(None))).fetchall()
+    for row in rows:
+        match = ARXIV_VERSION.match(row.arxiv_id)
+        version = match.group('version')
+        bind.execute(article.update().where(article.c.id == row.id).values(
+            arxiv_base_id=match.group('base'),
+            arxiv_version=int(version) if version else None
+        ))
+
+
+def downgrade():
+    with op.batch_alter_table('article', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_article_duplicate_of_id', type_='foreignkey')
+        batch_op.drop_index(batch_op.f('ix_article_duplicate_of_id'))
+        batch_op.drop_index(batch_op.f('ix_article_arxiv_base_id'))
+        batch_op.drop_column('duplicate_of_id')
+        batch_op.drop_column('arxiv_version')
+        batch_op.drop_column('arxiv_base_id')
+
+    op.drop_table('min_hash_band')
+    op.drop_table('min_hash_signature')
@@ -0,0 +1,44 @@
+"""Add full-text index over article full texts
+
+Revision ID: 5203ea786a8d
+Revises: 59c713809207
+Create Date: 2026-10-20 15:05:12.481230
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '5203ea786a8d'
+down_revision = '59c713809207'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Full text is stored compressed, so it is indexed by the database's own
+    # full-text engine; existing texts are indexed by build_fulltext_index.py
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE article_fts USING fts5(full_text, content='', tokenize='porter unicode61')"
+        )
+    elif dialect == 'postgresql':
+        op.create_table('article_fts',
+        sa.Column('article_id', sa.Integer(), nullable=False),
+        sa.Column('document', postgresql.TSVECTOR(), nullable=False),
+        sa.ForeignKeyConstraint(['article_id'], ['article.id'], ),
+        sa.PrimaryKeyConstraint('article_id')
+        )
+        op.create_index('ix_article_fts_document', 'article_fts', ['document'], unique=False, postgresql_using='gin')
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute("DROP TABLE article_fts")
+    elif dialect == 'postgresql':
+        op.drop_index('ix_article_fts_document', table_name='article_fts')
+        op.drop_table('article_fts')
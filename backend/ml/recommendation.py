@@ -1,12 +1,60 @@
-from sentence_transformers import SentenceTransformer
+from sklearn.feature_extraction.text import HashingVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
+from flask import has_app_context
+from services.index_store import get_index
+from services.backends import BackendRegistry
 
-model = SentenceTransformer('all-MiniLM-L6-v2')
+EMBEDDING_MODEL = 'all-MiniLM-L6-v2'
+HASHING_FEATURES = 1024
+
+embedders = BackendRegistry('EMBEDDER_BACKEND', 'sentence-transformers')
+
+@embedders.register('sentence-transformers')
+def _sentence_transformer_embedder():
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(EMBEDDING_MODEL).encode
+
+@embedders.register('hashing')
+def _hashing_embedder():
+    # Stateless and deterministic: no fitting, no model files, the same vector on every machine
+    vectorizer = HashingVectorizer(
+        n_features=HASHING_FEATURES, stop_words='english', alternate_sign=False,
+        ngram_range=(1, 2), norm='l2', dtype=np.float32
+    )
+    return lambda abstracts: vectorizer.transform(abstracts).toarray()
+
+def encode_abstracts(abstracts):
+    return embedders.get()(abstracts)
 
 def compute_article_embeddings(articles):
-    abstracts = [article['abstract'] for article in articles]
-    embeddings = model.encode(abstracts)
+    # Articles with an 'id' in the shared embeddings index are read from the mapped
+    # array; only the rest are encoded
+    index = get_index('embeddings') if has_app_context() else None
+    if index is not None and index.metadata.get('backend') != embedders.selected():
+        # Built by another embedder (or before the backend was recorded): its vectors don't fit
+        index = None
+    if index is None:
+        return encode_abstracts([article['abstract'] for article in articles])
+
+    ids = index.array('ids')
+    matrix = index.array('embeddings')
+    article_ids = np.array([article.get('id', -1) for article in articles], dtype=np.int64)
+    embeddings = np.empty((len(articles), matrix.shape[1]), dtype=np.float32)
+
+    found = np.zeros(len(articles), dtype=bool)
+    if len(ids):
+        rows = np.minimum(np.searchsorted(ids, article_ids), len(ids) - 1)
+        found = ids[rows] == article_ids
+        embeddings[found] = matrix[rows[found]]
+
+    missing = np.flatnonzero(~found)
+    if len(missing):
+        encoded = np.asarray(encode_abstracts([articles[i]['abstract'] for i in missing]), dtype=np.float32)
+        if encoded.shape[1] != matrix.shape[1]:
+            # Same backend, different configuration (e.g. HASHING_FEATURES changed since the build)
+            return encode_abstracts([article['abstract'] for article in articles])
+        embeddings[missing] = encoded
     return embeddings
 
 def content_based_recommendations(user_articles, all_articles, top_n=5):
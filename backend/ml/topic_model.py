@@ -0,0 +1,211 @@
+import os
+import json
+import logging
+from collections import defaultdict
+from datetime import datetime
+from flask import current_app
+from gensim.corpora import Dictionary
+from gensim.models import LdaModel
+from models import db, Article, Topic, ArticleTopic, TopicPrevalence
+from nlp.keywords import tokenize
+from services.index_store import publish_version, current_version
+
+logger = logging.getLogger(__name__)
+
+MIN_TOPIC_PROBABILITY = 0.05
+TOP_TERMS = 10
+# Months compared on each side when computing a topic's trend
+TREND_WINDOW = 3
+MODEL_FILE = 'lda.model'
+DICTIONARY_FILE = 'dictionary.dict'
+
+def article_tokens(article):
+    return tokenize(f"{article.title} {article.abstract}")
+
+def _model_paths(model_dir):
+    return os.path.join(model_dir, MODEL_FILE), os.path.join(model_dir, DICTIONARY_FILE)
+
+def load_topic_model():
+    # Models saved before versioning live directly in TOPIC_MODEL_DIR
+    model_dir = current_version(current_app.config['TOPIC_MODEL_DIR']) or current_app.config['TOPIC_MODEL_DIR']
+    model_path, dictionary_path = _model_paths(model_dir)
+    if not os.path.exists(model_path):
+        return None, None
+    return LdaModel.load(model_path), Dictionary.load(dictionary_path)
+
+def _version_flat_layout(model_dir):
+    # Move a model saved before versioning into a version directory of its own
+    flat_files = [
+        entry for entry in os.listdir(model_dir)
+        if entry.startswith((MODEL_FILE, DICTIONARY_FILE)) and os.path.isfile(os.path.join(model_dir, entry))
+    ]
+    if not flat_files:
+        return
+
+    def write(tmp_dir, version):
+        for entry in flat_files:
+            os.rename(os.path.join(model_dir, entry), os.path.join(tmp_dir, entry))
+
+    publish_version(model_dir, write)
+
+def save_topic_model(lda, dictionary):
+    # Saved into a fresh version directory and swapped in, so other workers never load a half-written model
+    model_dir = current_app.config['TOPIC_MODEL_DIR']
+    if current_version(model_dir) is None and os.path.isdir(model_dir):
+        _version_flat_layout(model_dir)
+
+    def write(tmp_dir, version):
+        model_path, dictionary_path = _model_paths(tmp_dir)
+        lda.save(model_path)
+        dictionary.save(dictionary_path)
+
+    publish_version(model_dir, write)
+
+def train_topic_model(num_topics=None, passes=5):
+    """Offline training on the whole corpus; replaces all stored topic results."""
+    num_topics = num_topics or current_app.config['NUM_TOPICS']
+    articles = Article.query.filter(Article.duplicate_of_id.is_(None)).all()
+    docs = [article_tokens(article) for article in articles]
+
+    dictionary = Dictionary(docs)
+    dictionary.filter_extremes(no_below=2, no_above=0.5)
+    if len(dictionary) == 0:
+        logger.info(f"Not enough shared vocabulary in {len(articles)} articles to train a topic model")
+        return None
+    corpus = [dictionary.doc2bow(doc) for doc in docs]
+
+    lda = LdaModel(
+        corpus,
+        id2word=dictionary,
+        num_topics=num_topics,
+        passes=passes,
+        chunksize=2000,
+        update_every=1,
+        random_state=42
+    )
+    save_topic_model(lda, dictionary)
+
+    ArticleTopic.query.delete()
+    TopicPrevalence.query.delete()
+    Topic.query.delete()
+    _assign_topics(lda, dictionary, articles)
+    _refresh_topics(lda)
+    _refresh_prevalence(_months(articles))
+    db.session.commit()
+    logger.info(f"Trained topic model with {num_topics} topics on {len(articles)} articles")
+    return lda
+
+def update_topic_model(articles):
+    """Online update with a new ingest batch; only the batch's months are re-aggregated."""
+    lda, dictionary = load_topic_model()
+    if lda is None:
+        # Bootstrap: the first ingest trains on everything stored so far
+        logger.info("No topic model trained yet, training one on the whole corpus")
+        train_topic_model()
+        return
+
+    # Words outside the trained vocabulary are ignored until the next offline training
+    corpus = [dictionary.doc2bow(article_tokens(article)) for article in articles]
+    corpus = [bow for bow in corpus if bow]
+    if corpus:
+        lda.update(corpus)
+        save_topic_model(lda, dictionary)
+
+    _assign_topics(lda, dictionary, articles)
+    _refresh_topics(lda)
+    _refresh_prevalence(_months(articles))
+    db.session.commit()
+
+def _months(articles):
+    return {article.publication_date.strftime('%Y-%m') for article in articles if article.publication_date}
+
+def _assign_topics(lda, dictionary, articles):
+    article_ids = [article.id for article in articles]
+    ArticleTopic.query.filter(ArticleTopic.article_id.in_(article_ids)).delete(synchronize_session=False)
+
+    for article in articles:
+        bow = dictionary.doc2bow(article_tokens(article))
+        for topic_id, weight in lda.get_document_topics(bow, minimum_probability=MIN_TOPIC_PROBABILITY):
+            db.session.add(ArticleTopic(article_id=article.id, topic_id=int(topic_id), weight=float(weight)))
+
+def _refresh_topics(lda):
+    counts = dict(
+        db.session.query(ArticleTopic.topic_id, db.func.count(ArticleTopic.article_id))
+        .group_by(ArticleTopic.topic_id).all()
+    )
+    existing = {topic.id: topic for topic in Topic.query.all()}
+
+    for topic_id in range(lda.num_topics):
+        terms = [(term, float(weight)) for term, weight in lda.show_topic(topic_id, topn=TOP_TERMS)]
+        topic = existing.get(topic_id) or Topic(id=topic_id)
+        topic.label = ' / '.join(term for term, _ in terms[:3])
+        topic.terms = json.dumps(terms)
+        topic.article_count = counts.get(topic_id, 0)
+        topic.updated_at = datetime.utcnow()
+        db.session.add(topic)
+
+def _refresh_prevalence(months):
+    if not months:
+        return
+    db.session.flush()
+
+    month_column = db.func.strftime('%Y-%m', Article.publication_date)
+    if db.engine.dialect.name == 'postgresql':
+        month_column = db.func.to_char(Article.publication_date, 'YYYY-MM')
+
+    articles_per_month = dict(
+        db.session.query(month_column, db.func.count(Article.id))
+        .filter(month_column.in_(months), Article.duplicate_of_id.is_(None))
+        .group_by(month_column).all()
+    )
+    rows = (
+        db.session.query(month_column, ArticleTopic.topic_id,
+                         db.func.sum(ArticleTopic.weight), db.func.count(ArticleTopic.article_id))
+        .join(Article, Article.id == ArticleTopic.article_id)
+        .filter(month_column.in_(months))
+        .group_by(month_column, ArticleTopic.topic_id).all()
+    )
+
+    TopicPrevalence.query.filter(TopicPrevalence.month.in_(months)).delete(synchronize_session=False)
+    for month, topic_id, weight_sum, count in rows:
+        # Share of the month's articles attributed to the topic
+        db.session.add(TopicPrevalence(
+            month=month,
+            topic_id=topic_id,
+            weight=weight_sum / articles_per_month[month],
+            article_count=count
+        ))
+    db.session.flush()
+    _refresh_trends()
+
+def _refresh_trends():
+    series = defaultdict(dict)
+    for row in TopicPrevalence.query.all():
+        series[row.topic_id][row.month] = row.weight
+    all_months = sorted({month for by_month in series.values() for month in by_month})
+    recent = all_months[-TREND_WINDOW:]
+    previous = all_months[-2 * TREND_WINDOW:-TREND_WINDOW]
+
+    for topic in Topic.query.all():
+        by_month = series.get(topic.id, {})
+        recent_share = sum(by_month.get(month, 0) for month in recent) / max(len(recent), 1)
+        previous_share = sum(by_month.get(month, 0) for month in previous) / max(len(previous), 1)
+        topic.trend = recent_share - previous_share if previous else 0.0
+
+def topic_summaries():
+    # Read-only view of the stored results, used by /api/topics and the dashboards
+    prevalence = defaultdict(dict)
+    for row in TopicPrevalence.query.order_by(TopicPrevalence.month).all():
+        prevalence[row.topic_id][row.month] = row.weight
+
+    return [
+        {
+            'id': topic.id,
+            'label': topic.label,
+            'terms': [term for term, _ in json.loads(topic.terms)],
+            'articleCount': topic.article_count,
+            'trend': topic.trend,
+            'prevalence': prevalence.get(topic.id, {})
+        }
+        for topic in Topic.query.order_by(Topic.article_count.desc()).all()
+    ]
@@ -23,17 +23,133 @@ class Article(db.Model):
     title = db.Column(db.String(255), nullable=False)
     authors = db.Column(db.Text, nullable=False)
     abstract = db.Column(db.Text, nullable=False)
-    full_text = db.Column(db.Text)
-    summary = db.Column(db.Text)
+    full_text_hash = db.Column(db.String(64), db.ForeignKey('text_blob.content_hash'))
+    summary_hash = db.Column(db.String(64), db.ForeignKey('text_blob.content_hash'))
     publication_date = db.Column(db.DateTime, default=datetime.utcnow)
     arxiv_id = db.Column(db.String(50), unique=True)
-    relevance = db.Column(db.Float)
+    arxiv_base_id = db.Column(db.String(50), index=True)
+    arxiv_version = db.Column(db.Integer)
+    categories = db.Column(db.String(255))  # space separated arXiv categories, e.g. 'cs.LG stat.ML'
+    duplicate_of_id = db.Column(db.Integer, db.ForeignKey('article.id'), index=True)
+    relevance = db.Column(db.Float)  # PageRank over the citation graph, 1.0 on average
+    citation_count = db.Column(db.Integer, default=0)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'))
     is_favorite = db.Column(db.Boolean, default=False)
+    # Set when a newer arXiv version replaces the metadata, so in-memory indexes re-read the row
+    updated_at = db.Column(db.DateTime, index=True)
+
+    # Large text lives compressed in text_blob and is only loaded when accessed
+    full_text_blob = db.relationship('TextBlob', foreign_keys=[full_text_hash], lazy='select')
+    summary_blob = db.relationship('TextBlob', foreign_keys=[summary_hash], lazy='select')
+    duplicate_of = db.relationship('Article', remote_side=[id], backref='duplicates')
+
+    @property
+    def full_text(self):
+        return self.full_text_blob.text if self.full_text_blob else None
+
+    @full_text.setter
+    def full_text(self, text):
+        self.full_text_blob = _store_text(text)
+
+    @property
+    def summary(self):
+        return self.summary_blob.text if self.summary_blob else None
+
+    @summary.setter
+    def summary(self, text):
+        self.summary_blob = _store_text(text)
 
     def __repr__(self):
         return f'<Article {self.title}>'
 
+class TextBlob(db.Model):
+    # Compressed, content-addressed text (article full texts and summaries)
+    content_hash = db.Column(db.String(64), primary_key=True)
+    codec = db.Column(db.String(16), nullable=False)
+    data = db.Column(db.LargeBinary, nullable=False)
+    size = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    @property
+    def text(self):
+        from services.text_store import decompress_text
+        return decompress_text(self.codec, self.data)
+
+def _store_text(text):
+    from services.text_store import store_text
+    return store_text(text) if text else None
+
+class MinHashSignature(db.Model):
+    article_id = db.Column(db.Integer, db.ForeignKey('article.id'), primary_key=True)
+    signature = db.Column(db.LargeBinary, nullable=False)
+
+    article = db.relationship('Article')
+
+class MinHashBand(db.Model):
+    # LSH index: one row per (band, bucket) an article's signature falls into
+    band = db.Column(db.SmallInteger, primary_key=True)
+    bucket = db.Column(db.BigInteger, primary_key=True)
+    article_id = db.Column(db.Integer, db.ForeignKey('article.id'), primary_key=True)
+
+    article = db.relationship('Article')
+
+class Citation(db.Model):
+    citing_id = db.Column(db.Integer, db.ForeignKey('article.id'), primary_key=True)
+    cited_arxiv_id = db.Column(db.String(50), primary_key=True, index=True)
+    # Empty until the cited paper is ingested
+    cited_id = db.Column(db.Integer, db.ForeignKey('article.id'), index=True)
+
+class SavedSearch(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    query_text = db.Column(db.String(255), nullable=False)
+    num_terms = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class SavedSearchTerm(db.Model):
+    term = db.Column(db.String(100), primary_key=True)
+    saved_search_id = db.Column(db.Integer, db.ForeignKey('saved_search.id'), primary_key=True)
+
+class Alert(db.Model):
+    # Per-user inbox; article fields are copied so reading alerts needs no joins
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    saved_search_id = db.Column(db.Integer, db.ForeignKey('saved_search.id'), nullable=False)
+    article_id = db.Column(db.Integer, db.ForeignKey('article.id'), nullable=False)
+    query_text = db.Column(db.String(255), nullable=False)
+    title = db.Column(db.String(255), nullable=False)
+    arxiv_id = db.Column(db.String(50))
+    is_read = db.Column(db.Boolean, default=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (db.UniqueConstraint('saved_search_id', 'article_id'),)
+
+class Topic(db.Model):
+    # id is the topic index in the stored LDA model
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    label = db.Column(db.String(255), nullable=False)
+    terms = db.Column(db.Text, nullable=False)  # JSON list of [term, weight]
+    article_count = db.Column(db.Integer, default=0)
+    trend = db.Column(db.Float, default=0.0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class ArticleTopic(db.Model):
+    article_id = db.Column(db.Integer, db.ForeignKey('article.id'), primary_key=True)
+    topic_id = db.Column(db.Integer, db.ForeignKey('topic.id'), primary_key=True, index=True)
+    weight = db.Column(db.Float, nullable=False)
+
+class TopicPrevalence(db.Model):
+    month = db.Column(db.String(7), primary_key=True)  # YYYY-MM
+    topic_id = db.Column(db.Integer, db.ForeignKey('topic.id'), primary_key=True)
+    weight = db.Column(db.Float, nullable=False)
+    article_count = db.Column(db.Integer, nullable=False)
+
+class ChunkSummary(db.Model):
+    # Summaries of individual document chunks, keyed by a hash of the chunk text
+    content_hash = db.Column(db.String(64), primary_key=True)
+    summary = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
 class SearchHistory(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
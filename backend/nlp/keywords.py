@@ -0,0 +1,12 @@
+import re
+from collections import Counter
+from nltk.corpus import stopwords
+
+_WORD = re.compile(r'[a-z][a-z\-]+')
+stop_words = set(stopwords.words('english'))
+
+def tokenize(text):
+    return [word for word in _WORD.findall((text or '').lower()) if len(word) > 2 and word not in stop_words]
+
+def extract_keywords(text, top_n=5):
+    return [word for word, _ in Counter(tokenize(text)).most_common(top_n)]
@@ -1,26 +1,162 @@
-from transformers import pipeline
+import hashlib
+from functools import lru_cache
 from nltk.tokenize import sent_tokenize
 from nltk.corpus import stopwords
 from nltk.cluster.util import cosine_distance
 import numpy as np
 import networkx as nx
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+from models import db, ChunkSummary
+from services.backends import BackendRegistry
 
-summarizer = pipeline("summarization", model="facebook/bart-large-cnn")
+SUMMARIZATION_MODEL = "facebook/bart-large-cnn"
+
+summarizers = BackendRegistry('SUMMARIZER_BACKEND', 'bart')
+_pipeline = None
+
+def get_pipeline():
+    # Loaded on first use so importing this module never pulls the model
+    global _pipeline
+    if _pipeline is None:
+        from transformers import pipeline
+        _pipeline = pipeline("summarization", model=SUMMARIZATION_MODEL)
+    return _pipeline
+
+@summarizers.register('bart')
+def _bart_summarizer():
+    return summarize_long_text
+
+@summarizers.register('extractive')
+def _extractive_summarizer():
+    return extractive_summarize
+
+def summarize_document(text):
+    return summarizers.get()(text)
+
+# BART accepts at most 1024 input tokens; leave headroom for special tokens
+CHUNK_MAX_TOKENS = 900
+CHUNK_BATCH_SIZE = 8
 
 def summarize_text(text, max_length=150, min_length=50):
-    summary = summarizer(text, max_length=max_length, min_length=min_length, do_sample=False)[0]['summary_text']
+    summary = get_pipeline()(text, max_length=max_length, min_length=min_length, do_sample=False)[0]['summary_text']
     return summary
 
+def summarize_long_text(text, max_length=150, min_length=50, max_chunk_tokens=CHUNK_MAX_TOKENS):
+    # Map: summarize every token-bounded chunk of the document
+    chunks = split_into_chunks(text, max_chunk_tokens)
+    if not chunks:
+        return ''
+    summaries = summarize_chunks(chunks, max_length=max_length, min_length=min_length)
+
+    # Reduce: summarize the combined chunk summaries until a single summary is left
+    while len(summaries) > 1:
+        chunks = split_into_chunks(' '.join(summaries), max_chunk_tokens)
+        summaries = summarize_chunks(chunks, max_length=max_length, min_length=min_length)
+
+    return summaries[0]
+
+def split_into_chunks(text, max_tokens=CHUNK_MAX_TOKENS):
+    tokenizer = get_pipeline().tokenizer
+    chunks = []
+    current = []
+    current_tokens = 0
+
+    for sentence in sent_tokenize(text or ''):
+        tokens = tokenizer.tokenize(sentence)
+        if not tokens:
+            continue
+
+        if len(tokens) > max_tokens:
+            # A single sentence that doesn't fit (tables, references) is cut on token boundaries
+            if current:
+                chunks.append(' '.join(current))
+                current, current_tokens = [], 0
+            for start in range(0, len(tokens), max_tokens):
+                chunks.append(tokenizer.convert_tokens_to_string(tokens[start:start + max_tokens]).strip())
+            continue
+
+        if current_tokens + len(tokens) > max_tokens:
+            chunks.append(' '.join(current))
+            current, current_tokens = [], 0
+
+        current.append(sentence)
+        current_tokens += len(tokens)
+
+    if current:
+        chunks.append(' '.join(current))
+
+    return chunks
+
+def chunk_hash(chunk, max_length, min_length):
+    # Generation parameters are part of the key so differently sized summaries don't collide
+    key = f"{max_length}:{min_length}:{chunk}"
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+def _insert_ignore(model):
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+        return insert(model).on_conflict_do_nothing()
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+        return insert(model).on_conflict_do_nothing()
+    if dialect in ('mysql', 'mariadb'):
+        return db.insert(model).prefix_with('IGNORE')
+    return db.insert(model)
+
+def summarize_chunks(chunks, max_length=150, min_length=50, batch_size=CHUNK_BATCH_SIZE):
+    hashes = [chunk_hash(chunk, max_length, min_length) for chunk in chunks]
+
+    cached = {
+        row.content_hash: row.summary
+        for row in ChunkSummary.query.filter(ChunkSummary.content_hash.in_(set(hashes))).all()
+    }
+
+    # Only chunks never seen before go through the model, each distinct chunk once
+    pending = {}
+    for content_hash, chunk in zip(hashes, chunks):
+        if content_hash not in cached:
+            pending.setdefault(content_hash, chunk)
+
+    if pending:
+        outputs = get_pipeline()(
+            list(pending.values()),
+            max_length=max_length,
+            min_length=min_length,
+            do_sample=False,
+            truncation=True,
+            batch_size=batch_size
+        )
+        rows = []
+        for content_hash, output in zip(pending, outputs):
+            cached[content_hash] = output['summary_text']
+            rows.append({'content_hash': content_hash, 'summary': output['summary_text']})
+        # Another ingest may cache the same chunk concurrently; whichever row lands first wins
+        db.session.execute(_insert_ignore(ChunkSummary), rows)
+
+    return [cached[content_hash] for content_hash in hashes]
+
+@lru_cache(maxsize=None)
+def english_stop_words():
+    return frozenset(stopwords.words('english'))
+
 def extractive_summarize(text, num_sentences=3):
-    sentences = sent_tokenize(text)
-    stop_words = set(stopwords.words('english'))
-
-    # Create sentence similarity matrix
-    sentence_similarity_matrix = np.zeros((len(sentences), len(sentences)))
-    for i in range(len(sentences)):
-        for j in range(len(sentences)):
-            if i != j:
-                sentence_similarity_matrix[i][j] = sentence_similarity(sentences[i], sentences[j], stop_words)
+    sentences = sent_tokenize(text or '')
+    if len(sentences) <= num_sentences:
+        return ' '.join(sentences)
+    stop_words = english_stop_words()
+
+    # Create sentence similarity matrix: cosine of the sentences' word counts,
+    # the same measure as sentence_similarity but computed for all pairs at once
+    vectorizer = CountVectorizer(tokenizer=str.split, token_pattern=None, stop_words=sorted(stop_words))
+    try:
+        counts = vectorizer.fit_transform(sentences)
+    except ValueError:
+        # Nothing but stop words
+        return ' '.join(sentences[:num_sentences])
+    sentence_similarity_matrix = cosine_similarity(counts)
+    np.fill_diagonal(sentence_similarity_matrix, 0)
 
     # Use PageRank algorithm to rank sentences
     sentence_similarity_graph = nx.from_numpy_array(sentence_similarity_matrix)
@@ -23,19 +23,23 @@ def get_recommendations():
     
     return jsonify(recommendations_data)
 
-@article_bp.route('/graph', methods=['GET'])
-def get_article_graph():
-    # This is a placeholder implementation. You should implement the actual graph generation logic.
-    graph_data = {
-        "nodes": [
-            {"id": "ML", "group": 1},
-            {"id": "Mining", "group": 2},
-            {"id": "Data Analysis", "group": 3}
-        ],
-        "links": [
-            {"source": "ML", "target": "Mining"},
-            {"source": "ML", "target": "Data Analysis"},
-            {"source": "Mining", "target": "Data Analysis"}
-        ]
-    }
-    return jsonify(graph_data)
\ No newline at end of file
+@article_bp.route('/<int:article_id>', methods=['GET'])
+def get_article_detail(article_id):
+    article = Article.query.get(article_id)
+    if not article:
+        return jsonify({"error": "Article not found"}), 404
+
+    publication_date = article.publication_date.isoformat() if article.publication_date else None
+
+    # full_text and summary are decompressed from text_blob only here, never in list views
+    return jsonify({
+        'id': article.id,
+        'title': article.title,
+        'authors': article.authors.split(', '),
+        'abstract': article.abstract,
+        'summary': article.summary,
+        'fullText': article.full_text,
+        'publicationDate': publication_date,
+        'relevance': article.relevance or 0,
+        'arxiv_id': article.arxiv_id
+    })
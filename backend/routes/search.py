@@ -1,18 +1,20 @@
 from flask import Blueprint, request, jsonify
 from models import Article
+from services.suggest_index import get_suggest_index
+from services.search_service import parse_filters, build_article_query, rank_articles
+from services.facet_index import get_facet_index
+from services.response_encoding import encode_response
 
 search_bp = Blueprint('search', __name__)
 
 @search_bp.route('/', methods=['POST'])
 def search():
-    query = request.json.get('query', '')
-    
-    # Search in the database
-    articles = Article.query.filter(
-        (Article.title.ilike(f'%{query}%')) |
-        (Article.abstract.ilike(f'%{query}%')) |
-        (Article.full_text.ilike(f'%{query}%'))
-    ).all()
+    data = request.json or {}
+    query = data.get('query', '')
+    filters = parse_filters(data.get('filters'))
+
+    # Search in the database, with filters applied in SQL
+    articles = rank_articles(query, build_article_query(query, filters).all())
     
     # Convert to dictionary for JSON response
     articles_data = []
@@ -26,7 +28,22 @@ def search():
             'abstract': article.abstract,
             'publicationDate': publication_date,
             'relevance': article.relevance or 0,
-            'arxiv_id': article.arxiv_id
+            'arxiv_id': article.arxiv_id,
+            'categories': article.categories.split() if article.categories else []
         })
     
-    return jsonify(articles_data)
\ No newline at end of file
+    # Facet counts come from the facet index postings, not from the rows above
+    if data.get('facets'):
+        article_ids = [article.id for article in articles]
+        facets = get_facet_index(article_ids).counts(article_ids)
+        return encode_response({'results': articles_data, 'facets': facets})
+
+    return encode_response(articles_data)
+
+@search_bp.route('/suggest', methods=['GET'])
+def suggest():
+    prefix = request.args.get('q', '')
+    limit = min(request.args.get('limit', 10, type=int), 50)
+
+    # Served entirely from the in-memory prefix index, no database scan per keystroke
+    return jsonify(get_suggest_index().suggest(prefix, limit))
@@ -1,8 +1,101 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, request, jsonify
+from models import User, SavedSearch, Alert
+from services.alert_service import create_saved_search, delete_saved_search, mark_alerts_read
 
 user_bp = Blueprint('user', __name__)
 
+def _user_id(data):
+    # JSON bodies may carry the id as a string; the query string is parsed the same way
+    try:
+        return int(data['user_id']) if data.get('user_id') is not None else request.args.get('user_id', type=int)
+    except (TypeError, ValueError):
+        return None
+
 @user_bp.route('/profile', methods=['GET'])
 def get_user_profile():
     # Placeholder implementation
-    return jsonify({"message": "User profile fetched successfully"}), 200
\ No newline at end of file
+    return jsonify({"message": "User profile fetched successfully"}), 200
+
+@user_bp.route('/saved-searches', methods=['GET', 'POST'])
+def saved_searches():
+    data = request.get_json(silent=True) or {}
+    user_id = _user_id(data)
+    if not user_id or not User.query.get(user_id):
+        return jsonify({"message": "A valid user_id is required"}), 400
+
+    if request.method == 'POST':
+        query = (data.get('query') or '').strip()
+        if not query:
+            return jsonify({"message": "Query is required"}), 400
+        saved_search = create_saved_search(user_id, query)
+        if saved_search is None:
+            return jsonify({"message": "Query has no searchable terms"}), 400
+        return jsonify({
+            'id': saved_search.id,
+            'query': saved_search.query_text,
+            'createdAt': saved_search.created_at.isoformat()
+        }), 201
+
+    searches = SavedSearch.query.filter_by(user_id=user_id).order_by(SavedSearch.created_at.desc()).all()
+    return jsonify([
+        {'id': s.id, 'query': s.query_text, 'createdAt': s.created_at.isoformat()}
+        for s in searches
+    ]), 200
+
+@user_bp.route('/saved-searches/<int:saved_search_id>', methods=['DELETE'])
+def remove_saved_search(saved_search_id):
+    data = request.get_json(silent=True) or {}
+    user_id = _user_id(data)
+    if not user_id:
+        return jsonify({"message": "user_id is required"}), 400
+
+    # Another user's saved search is reported as missing rather than forbidden
+    saved_search = SavedSearch.query.get(saved_search_id)
+    if not saved_search or saved_search.user_id != user_id:
+        return jsonify({"message": "Saved search not found"}), 404
+    delete_saved_search(saved_search)
+    return jsonify({"message": "Saved search deleted"}), 200
+
+@user_bp.route('/alerts', methods=['GET'])
+def get_alerts():
+    user_id = request.args.get('user_id', type=int)
+    if not user_id:
+        return jsonify({"message": "user_id is required"}), 400
+    limit = min(request.args.get('limit', 50, type=int), 200)
+
+    # Alerts are written at ingest time; this only reads the user's inbox
+    alerts = Alert.query.filter_by(user_id=user_id)
+    if request.args.get('unread') == 'true':
+        alerts = alerts.filter(Alert.is_read.is_(False))
+    alerts = alerts.order_by(Alert.created_at.desc()).limit(limit).all()
+
+    return jsonify([
+        {
+            'id': alert.id,
+            'query': alert.query_text,
+            'articleId': alert.article_id,
+            'title': alert.title,
+            'arxiv_id': alert.arxiv_id,
+            'isRead': alert.is_read,
+            'createdAt': alert.created_at.isoformat()
+        }
+        for alert in alerts
+    ]), 200
+
+@user_bp.route('/alerts/read', methods=['POST'])
+def read_alerts():
+    data = request.get_json(silent=True) or {}
+    user_id = _user_id(data)
+    if not user_id:
+        return jsonify({"message": "user_id is required"}), 400
+
+    # Without ids every alert in the user's inbox is marked read
+    alert_ids = data.get('ids')
+    if alert_ids is not None:
+        try:
+            alert_ids = [int(alert_id) for alert_id in alert_ids]
+        except (TypeError, ValueError):
+            return jsonify({"message": "ids must be a list of alert ids"}), 400
+
+    updated = mark_alerts_read(user_id, alert_ids)
+    return jsonify({"message": f"Marked {updated} alerts as read", "updated": updated}), 200
@@ -0,0 +1,95 @@
+import re
+import logging
+from collections import defaultdict
+from models import db, SavedSearch, SavedSearchTerm, Alert
+from services.search_service import tokenize_text
+
+logger = logging.getLogger(__name__)
+
+TERM_BATCH_SIZE = 500
+MAX_TERM_LENGTH = 100
+# Punctuation tokens ('?', '``', '(') would each become a required term that no article has
+_TERM = re.compile(r'\w[\w\-]*')
+
+def alert_terms(text):
+    return {term for term in tokenize_text(text) if _TERM.fullmatch(term) and len(term) <= MAX_TERM_LENGTH}
+
+def query_terms(query):
+    return sorted(alert_terms(query))
+
+def create_saved_search(user_id, query):
+    terms = query_terms(query)
+    if not terms:
+        return None
+
+    saved_search = SavedSearch(user_id=user_id, query_text=query, num_terms=len(terms))
+    db.session.add(saved_search)
+    db.session.flush()
+    # Reverse index: term -> saved searches containing it
+    for term in terms:
+        db.session.add(SavedSearchTerm(term=term, saved_search_id=saved_search.id))
+    db.session.commit()
+    return saved_search
+
+def delete_saved_search(saved_search):
+    SavedSearchTerm.query.filter_by(saved_search_id=saved_search.id).delete()
+    Alert.query.filter_by(saved_search_id=saved_search.id).delete()
+    db.session.delete(saved_search)
+    db.session.commit()
+
+def mark_alerts_read(user_id, alert_ids=None):
+    alerts = Alert.query.filter(Alert.user_id == user_id, Alert.is_read.is_(False))
+    if alert_ids is not None:
+        alerts = alerts.filter(Alert.id.in_(alert_ids))
+    updated = alerts.update({Alert.is_read: True}, synchronize_session=False)
+    db.session.commit()
+    return updated
+
+def match_saved_searches(articles):
+    """Percolate a new batch through all saved searches and fill the alert inboxes.
+
+    Only postings for terms that occur in the batch are read, so the cost grows
+    with the batch, not with the number of saved queries times the corpus.
+    """
+    article_terms = {article.id: alert_terms(f"{article.title} {article.abstract}") for article in articles}
+    batch_terms = list(set().union(*article_terms.values())) if article_terms else []
+
+    postings = defaultdict(list)
+    for start in range(0, len(batch_terms), TERM_BATCH_SIZE):
+        for term, saved_search_id in (
+            db.session.query(SavedSearchTerm.term, SavedSearchTerm.saved_search_id)
+            .filter(SavedSearchTerm.term.in_(batch_terms[start:start + TERM_BATCH_SIZE])).all()
+        ):
+            postings[term].append(saved_search_id)
+    if not postings:
+        return 0
+
+    candidate_ids = {saved_search_id for ids in postings.values() for saved_search_id in ids}
+    saved_searches = {
+        saved_search.id: saved_search
+        for saved_search in SavedSearch.query.filter(SavedSearch.id.in_(candidate_ids)).all()
+    }
+
+    matches = 0
+    for article in articles:
+        matched_terms = defaultdict(int)
+        for term in article_terms[article.id]:
+            for saved_search_id in postings.get(term, ()):
+                matched_terms[saved_search_id] += 1
+
+        # A saved search matches when every one of its terms is in the article
+        for saved_search_id, count in matched_terms.items():
+            saved_search = saved_searches[saved_search_id]
+            if count == saved_search.num_terms:
+                db.session.add(Alert(
+                    user_id=saved_search.user_id,
+                    saved_search_id=saved_search.id,
+                    article_id=article.id,
+                    query_text=saved_search.query_text,
+                    title=article.title,
+                    arxiv_id=article.arxiv_id
+                ))
+                matches += 1
+
+    logger.info(f"Matched {matches} saved-search alerts for {len(articles)} new articles")
+    return matches
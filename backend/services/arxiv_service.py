@@ -1,9 +1,26 @@
-import arxiv
+import gzip
+import json
 from datetime import datetime, timedelta
 from dateutil.parser import parse
 from dateutil.tz import tzutc
+from services.backends import BackendRegistry, setting
+
+paper_sources = BackendRegistry('PAPER_SOURCE', 'arxiv')
 
 def fetch_arxiv_papers():
+    return paper_sources.get()()
+
+@paper_sources.register('arxiv')
+def _arxiv_source():
+    return fetch_live_papers
+
+@paper_sources.register('fixture')
+def _fixture_source():
+    return lambda: load_paper_fixture(setting('PAPER_FIXTURE_PATH'))
+
+def fetch_live_papers():
+    import arxiv
+
     # Define the search query for ML papers related to mining/metallurgy
     search_query = 'cat:cs.LG AND (mining OR metallurgy OR "mineral processing")'
     
@@ -26,16 +43,31 @@ def fetch_arxiv_papers():
         # Parse the published date and make it timezone-aware
         published_date = parse(result.published.isoformat()).replace(tzinfo=tzutc())
         if published_date > start_date:
-            # Fetch the full text (if possible)
-            full_text = result.summary  # Use the abstract as a placeholder
             paper = {
                 'title': result.title,
                 'authors': [author.name for author in result.authors],
                 'abstract': result.summary,
                 'arxiv_id': result.entry_id.split('/')[-1],
                 'publication_date': published_date,
-                'full_text': full_text
+                'categories': result.categories
             }
             papers.append(paper)
     
-    return papers
\ No newline at end of file
+    return papers
+
+def load_paper_fixture(path):
+    """Papers from a JSONL file (optionally gzipped) in the format fetch_arxiv_papers returns."""
+    if not path:
+        raise ValueError("PAPER_FIXTURE_PATH must be set to use the fixture paper source")
+
+    opener = gzip.open if path.endswith('.gz') else open
+    papers = []
+    with opener(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            paper = json.loads(line)
+            paper['publication_date'] = parse(paper['publication_date'])
+            papers.append(paper)
+
+    return papers
@@ -0,0 +1,46 @@
+import os
+import logging
+from flask import current_app, has_app_context
+
+logger = logging.getLogger(__name__)
+
+def setting(key, default=None):
+    # App config inside a request or app context, the environment in plain scripts
+    if has_app_context():
+        return current_app.config.get(key) or default
+    return os.environ.get(key) or default
+
+class BackendRegistry:
+    """Named implementations of one pipeline component, chosen by a config key.
+
+    Factories run on first use of their backend, so heavy models are only
+    loaded when that backend is actually selected.
+    """
+
+    def __init__(self, config_key, default):
+        self.config_key = config_key
+        self.default = default
+        self._factories = {}
+        self._instances = {}
+
+    def register(self, name):
+        def decorator(factory):
+            self._factories[name] = factory
+            return factory
+        return decorator
+
+    @property
+    def names(self):
+        return sorted(self._factories)
+
+    def selected(self):
+        return setting(self.config_key, self.default)
+
+    def get(self, name=None):
+        name = name or self.selected()
+        if name not in self._factories:
+            raise ValueError(f"Unknown {self.config_key} '{name}', expected one of: {', '.join(self.names)}")
+        if name not in self._instances:
+            logger.info(f"Loading {self.config_key} backend '{name}'")
+            self._instances[name] = self._factories[name]()
+        return self._instances[name]
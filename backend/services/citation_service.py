@@ -0,0 +1,185 @@
+import re
+import json
+import logging
+from collections import defaultdict
+import numpy as np
+from scipy.sparse import csr_matrix
+from models import db, Article, Citation
+from services.dedupe_service import split_arxiv_version
+
+logger = logging.getLogger(__name__)
+
+DAMPING = 0.85
+TOLERANCE = 1e-8
+MAX_ITERATIONS = 100
+# Stored relevance is rescaled so the average article scores 1.0; smaller changes aren't written back
+RELEVANCE_EPSILON = 1e-3
+RESOLVE_BATCH_SIZE = 500
+
+# New-style ids (2301.12345v2) and old-style ids (math.GT/0309136), optionally prefixed with 'arXiv:'
+ARXIV_REFERENCE = re.compile(
+    r'(?:arxiv:\s*)?\b(\d{4}\.\d{4,5}(?:v\d+)?|[a-z\-]+(?:\.[A-Z]{2})?/\d{7}(?:v\d+)?)\b',
+    re.IGNORECASE
+)
+
+def extract_references(text):
+    references = []
+    seen = set()
+    for match in ARXIV_REFERENCE.finditer(text or ''):
+        base_id, _ = split_arxiv_version(match.group(1))
+        if base_id not in seen:
+            seen.add(base_id)
+            references.append(base_id)
+    return references
+
+def load_reference_fixture(path):
+    # JSONL with one {"arxiv_id": ..., "references": [...]} object per line
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                yield record['arxiv_id'], record.get('references', [])
+
+def _resolve(base_ids):
+    """Hash index from arXiv base id to the canonical article id, for the given ids only."""
+    resolved = {}
+    base_ids = list(base_ids)
+    for start in range(0, len(base_ids), RESOLVE_BATCH_SIZE):
+        rows = (
+            db.session.query(Article.arxiv_base_id, Article.id, Article.duplicate_of_id)
+            .filter(Article.arxiv_base_id.in_(base_ids[start:start + RESOLVE_BATCH_SIZE]))
+            .all()
+        )
+        for base_id, article_id, duplicate_of_id in rows:
+            # Citations of a near-duplicate count for the paper it was linked to
+            resolved[base_id] = duplicate_of_id or article_id
+    return resolved
+
+def add_citations(references):
+    """references: dict of citing article id -> list of referenced arXiv ids.
+
+    References to papers that aren't ingested yet are kept with an empty cited_id
+    and linked by link_new_articles once the paper arrives.
+    """
+    references = {
+        citing_id: [split_arxiv_version(arxiv_id)[0] for arxiv_id in refs]
+        for citing_id, refs in references.items() if refs
+    }
+    if not references:
+        return 0
+
+    resolved = _resolve({base_id for refs in references.values() for base_id in refs})
+    existing = defaultdict(set)
+    for citing_id, cited_arxiv_id in (
+        db.session.query(Citation.citing_id, Citation.cited_arxiv_id)
+        .filter(Citation.citing_id.in_(list(references))).all()
+    ):
+        existing[citing_id].add(cited_arxiv_id)
+
+    added = 0
+    for citing_id, refs in references.items():
+        for base_id in refs:
+            cited_id = resolved.get(base_id)
+            if cited_id == citing_id or base_id in existing[citing_id]:
+                continue
+            existing[citing_id].add(base_id)
+            db.session.add(Citation(citing_id=citing_id, cited_arxiv_id=base_id, cited_id=cited_id))
+            added += 1
+    return added
+
+def add_citations_by_arxiv_id(records):
+    """records: iterable of (citing arXiv id, references), e.g. from load_reference_fixture."""
+    records = list(records)
+    citing = _resolve({split_arxiv_version(arxiv_id)[0] for arxiv_id, _ in records})
+    references = defaultdict(list)
+    for arxiv_id, refs in records:
+        citing_id = citing.get(split_arxiv_version(arxiv_id)[0])
+        if citing_id is not None:
+            references[citing_id].extend(refs)
+    return add_citations(references)
+
+def link_new_articles(articles):
+    # Earlier references to these papers can now point at them; references to a
+    # near-duplicate count for the paper it was linked to, as in _resolve
+    for article in articles:
+        cited_id = article.duplicate_of_id or article.id
+        Citation.query.filter(
+            Citation.cited_arxiv_id == article.arxiv_base_id,
+            Citation.cited_id.is_(None),
+            Citation.citing_id != cited_id
+        ).update({'cited_id': cited_id}, synchronize_session=False)
+
+def pagerank(n, sources, targets, start=None, damping=DAMPING, tol=TOLERANCE, max_iter=MAX_ITERATIONS):
+    """Power iteration over a sparse column-stochastic matrix; returns (ranks summing to 1, iterations)."""
+    out_degree = np.bincount(sources, minlength=n).astype(np.float64)
+    transition = csr_matrix(
+        (1.0 / out_degree[sources], (targets, sources)),
+        shape=(n, n)
+    )
+    dangling = out_degree == 0
+
+    rank = np.full(n, 1.0 / n) if start is None else start / start.sum()
+    for iteration in range(1, max_iter + 1):
+        # Papers without resolved references spread their rank uniformly
+        new_rank = damping * (transition @ rank + rank[dangling].sum() / n) + (1 - damping) / n
+        delta = np.abs(new_rank - rank).sum()
+        rank = new_rank
+        if delta < tol:
+            break
+    return rank, iteration
+
+def update_citation_scores():
+    """Recompute citation counts and PageRank, warm-started from the stored relevance.
+
+    Every canonical article and every resolved edge is reloaded on each call;
+    the warm start only cuts the number of iterations, and only articles whose
+    score or count changed are written back.
+    """
+    rows = (
+        db.session.query(Article.id, Article.relevance, Article.citation_count)
+        .filter(Article.duplicate_of_id.is_(None))
+        .order_by(Article.id).all()
+    )
+    if not rows:
+        return 0
+    ids = np.array([row[0] for row in rows], dtype=np.int64)
+    n = len(ids)
+
+    edges = np.array(
+        db.session.query(Citation.citing_id, Citation.cited_id).filter(Citation.cited_id.isnot(None)).all(),
+        dtype=np.int64
+    ).reshape(-1, 2)
+    sources = np.searchsorted(ids, edges[:, 0])
+    targets = np.searchsorted(ids, edges[:, 1])
+    # Drop edges touching articles that are no longer canonical
+    valid = (sources < n) & (targets < n)
+    valid[valid] &= (ids[sources[valid]] == edges[valid, 0]) & (ids[targets[valid]] == edges[valid, 1])
+    sources, targets = sources[valid], targets[valid]
+
+    # Articles scored before start from their previous rank, new ones from the average
+    previous = np.array([row[1] if row[1] is not None else 1.0 for row in rows], dtype=np.float64)
+    rank, iterations = pagerank(n, sources, targets, start=previous)
+    relevance = rank * n
+    citation_counts = np.bincount(targets, minlength=n)
+
+    updates = []
+    for i, (article_id, old_relevance, old_count) in enumerate(rows):
+        if (old_relevance is None or abs(relevance[i] - old_relevance) > RELEVANCE_EPSILON
+                or old_count != citation_counts[i]):
+            updates.append({'id': article_id, 'relevance': float(relevance[i]), 'citation_count': int(citation_counts[i])})
+    db.session.bulk_update_mappings(Article, updates)
+    logger.info(f"PageRank converged in {iterations} iterations over {len(sources)} citations; updated {len(updates)} articles")
+    return len(updates)
+
+def citations_per_year():
+    citing_year = db.extract('year', Article.publication_date)
+    rows = (
+        db.session.query(citing_year, db.func.count())
+        .select_from(Citation)
+        .join(Article, Article.id == Citation.citing_id)
+        .filter(Citation.cited_id.isnot(None), Article.publication_date.isnot(None))
+        .group_by(citing_year)
+        .order_by(citing_year)
+        .all()
+    )
+    return {str(int(year)): count for year, count in rows}
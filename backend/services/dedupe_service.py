@@ -0,0 +1,110 @@
+import re
+import hashlib
+import numpy as np
+from models import db, Article, MinHashSignature, MinHashBand
+
+NUM_PERM = 128
+NUM_BANDS = 16
+ROWS_PER_BAND = NUM_PERM // NUM_BANDS
+SHINGLE_SIZE = 3
+# Estimated Jaccard similarity above which two papers are treated as the same work
+DUPLICATE_THRESHOLD = 0.8
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+# Fixed seed: signatures are persisted, so the permutations must never change
+_rng = np.random.RandomState(1)
+_PERM_A = _rng.randint(1, (1 << 61) - 1, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, (1 << 61) - 1, size=NUM_PERM, dtype=np.uint64)
+
+_ARXIV_VERSION = re.compile(r'^(?P<base>.+?)(?:v(?P<version>\d+))?$')
+_WORD = re.compile(r'\w+')
+
+def split_arxiv_version(arxiv_id):
+    # '2301.12345v2' -> ('2301.12345', 2); unversioned ids have version None
+    match = _ARXIV_VERSION.match(arxiv_id)
+    version = match.group('version')
+    return match.group('base'), int(version) if version else None
+
+def shingles(text, size=SHINGLE_SIZE):
+    words = _WORD.findall(text.lower())
+    if len(words) < size:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+def minhash_signature(text):
+    hashes = np.array(
+        [int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=4).digest(), 'little')
+         for s in shingles(text)],
+        dtype=np.uint64
+    )
+    if hashes.size == 0:
+        return np.full(NUM_PERM, _MAX_HASH, dtype=np.uint64)
+
+    # Universal hashing (a*x + b) mod p, one row per permutation; overflow wraps like datasketch
+    with np.errstate(over='ignore'):
+        permuted = (np.outer(hashes, _PERM_A) + _PERM_B) % _MERSENNE_PRIME & _MAX_HASH
+    return permuted.min(axis=0)
+
+def paper_signature(title, abstract):
+    return minhash_signature(f"{title} {abstract}")
+
+def band_buckets(signature):
+    buckets = []
+    for band in range(NUM_BANDS):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(rows.tobytes(), digest_size=8).digest()
+        buckets.append((band, int.from_bytes(digest, 'little', signed=True)))
+    return buckets
+
+def estimate_jaccard(signature1, signature2):
+    return float(np.mean(signature1 == signature2))
+
+def find_near_duplicate(signature, threshold=DUPLICATE_THRESHOLD):
+    """Return (article_id, similarity) of the closest indexed paper, or None.
+
+    Only papers sharing at least one LSH band bucket are compared, so the
+    cost depends on the number of candidates, not on the corpus size.
+    """
+    bucket_filter = db.or_(*[
+        db.and_(MinHashBand.band == band, MinHashBand.bucket == bucket)
+        for band, bucket in band_buckets(signature)
+    ])
+    candidate_ids = {
+        article_id for (article_id,) in
+        db.session.query(MinHashBand.article_id).filter(bucket_filter).distinct().all()
+    }
+    if not candidate_ids:
+        return None
+
+    best = None
+    for row in MinHashSignature.query.filter(MinHashSignature.article_id.in_(candidate_ids)).all():
+        similarity = estimate_jaccard(signature, np.frombuffer(row.signature, dtype=np.uint64))
+        if similarity >= threshold and (best is None or similarity > best[1]):
+            best = (row.article_id, similarity)
+    return best
+
+def index_signature(article, signature):
+    db.session.add(MinHashSignature(article=article, signature=signature.tobytes()))
+    for band, bucket in band_buckets(signature):
+        db.session.add(MinHashBand(band=band, bucket=bucket, article=article))
+
+def index_existing_articles(batch_size=1000):
+    # Backfill signatures for canonical articles that predate the LSH index
+    indexed = db.session.query(MinHashSignature.article_id)
+    query = Article.query.filter(
+        Article.duplicate_of_id.is_(None),
+        ~Article.id.in_(indexed)
+    ).order_by(Article.id)
+
+    count = 0
+    while True:
+        articles = query.limit(batch_size).all()
+        if not articles:
+            break
+        for article in articles:
+            index_signature(article, paper_signature(article.title, article.abstract))
+        db.session.commit()
+        count += len(articles)
+    return count
@@ -0,0 +1,157 @@
+import time
+import threading
+import numpy as np
+from scipy.sparse import csr_matrix
+from models import db, Article
+
+FACETS = ('year', 'author', 'category', 'favorite')
+REFRESH_INTERVAL = 30
+LOAD_BATCH_SIZE = 5000
+
+POSTING_FACETS = tuple(facet for facet in FACETS if facet != 'favorite')
+
+def _empty_postings():
+    return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+class FacetIndex:
+    """Per-facet postings as sparse value-by-document matrices.
+
+    Counting a facet for a result set is one sparse matrix-vector product with
+    the result set's 0/1 mask over the indexed documents.
+    """
+
+    def __init__(self):
+        self._values = {facet: [] for facet in POSTING_FACETS}
+        self._value_index = {facet: {} for facet in POSTING_FACETS}
+        # Postings as COO coordinates (value rows, document columns), rebuilt for updated documents
+        self._postings = {facet: _empty_postings() for facet in POSTING_FACETS}
+        # (doc_ids, matrices, values) published together, so readers never mix two refreshes
+        self._snapshot = (np.zeros(0, dtype=np.int64), {}, {})
+        self._lock = threading.Lock()
+        self.last_article_id = 0
+        self.last_updated_at = None
+        self.last_refresh = 0.0
+
+    @property
+    def doc_ids(self):
+        return self._snapshot[0]
+
+    def _value_row(self, facet, value):
+        index = self._value_index[facet]
+        if value not in index:
+            index[value] = len(self._values[facet])
+            self._values[facet].append(value)
+        return index[value]
+
+    def _add_postings(self, postings, column, publication_date, authors, categories):
+        def add(facet, value):
+            postings[facet][0].append(self._value_row(facet, value))
+            postings[facet][1].append(column)
+
+        if publication_date:
+            add('year', str(publication_date.year))
+        for author in authors.split(', '):
+            add('author', author)
+        for category in (categories or '').split():
+            add('category', category)
+
+    def refresh(self):
+        with self._lock:
+            doc_ids = self.doc_ids
+            query = (
+                db.session.query(Article.id, Article.publication_date, Article.authors, Article.categories)
+                .filter(Article.duplicate_of_id.is_(None))
+            )
+            # Taken before reading so an update committed meanwhile is picked up next time
+            last_updated_at = db.session.query(db.func.max(Article.updated_at)).scalar()
+            postings = {facet: ([], []) for facet in POSTING_FACETS}
+
+            # Documents whose metadata a newer arXiv version replaced get their postings rebuilt
+            updated_columns = []
+            if len(doc_ids):
+                updated = query.filter(Article.id <= self.last_article_id, Article.updated_at.isnot(None))
+                if self.last_updated_at is not None:
+                    updated = updated.filter(Article.updated_at > self.last_updated_at)
+                for article_id, publication_date, authors, categories in updated.yield_per(LOAD_BATCH_SIZE):
+                    column = int(np.searchsorted(doc_ids, article_id))
+                    if column < len(doc_ids) and doc_ids[column] == article_id:
+                        updated_columns.append(column)
+                        self._add_postings(postings, column, publication_date, authors, categories)
+
+            new_ids = []
+            rows = query.filter(Article.id > self.last_article_id).order_by(Article.id).yield_per(LOAD_BATCH_SIZE)
+            for article_id, publication_date, authors, categories in rows:
+                self._add_postings(postings, len(doc_ids) + len(new_ids), publication_date, authors, categories)
+                new_ids.append(article_id)
+
+            if new_ids:
+                doc_ids = np.concatenate([doc_ids, np.array(new_ids, dtype=np.int64)])
+                self.last_article_id = new_ids[-1]
+            self.last_updated_at = last_updated_at
+
+            n_docs = len(doc_ids)
+            matrices = {}
+            for facet in POSTING_FACETS:
+                value_rows, value_cols = self._postings[facet]
+                if updated_columns:
+                    keep = ~np.isin(value_cols, updated_columns)
+                    value_rows, value_cols = value_rows[keep], value_cols[keep]
+                new_rows, new_cols = postings[facet]
+                value_rows = np.concatenate([value_rows, np.array(new_rows, dtype=np.int64)])
+                value_cols = np.concatenate([value_cols, np.array(new_cols, dtype=np.int64)])
+                self._postings[facet] = value_rows, value_cols
+                matrices[facet] = csr_matrix(
+                    (np.ones(len(value_rows), dtype=np.int32), (value_rows, value_cols)),
+                    shape=(len(self._values[facet]), n_docs)
+                )
+
+            # Favorite status changes after ingest, so its postings are reloaded every time
+            favorite_ids = np.array(
+                [article_id for (article_id,) in db.session.query(Article.id).filter(Article.is_favorite.is_(True)).all()],
+                dtype=np.int64
+            )
+            favorite_mask = _mask(doc_ids, favorite_ids)
+            matrices['favorite'] = csr_matrix(np.vstack([favorite_mask, ~favorite_mask]).astype(np.int32))
+
+            values = {facet: tuple(self._values[facet]) for facet in POSTING_FACETS}
+            values['favorite'] = (True, False)
+            self._snapshot = (doc_ids, matrices, values)
+            self.last_refresh = time.monotonic()
+
+    def mask(self, article_ids):
+        return _mask(self.doc_ids, article_ids)
+
+    def counts(self, article_ids, limit=10):
+        doc_ids, matrices, values = self._snapshot
+        mask = _mask(doc_ids, article_ids).astype(np.int32)
+        facets = {}
+        for facet, matrix in matrices.items():
+            counts = matrix @ mask
+            nonzero = np.flatnonzero(counts)
+            if len(nonzero) > limit:
+                nonzero = nonzero[np.argpartition(-counts[nonzero], limit)[:limit]]
+            top = nonzero[np.argsort(-counts[nonzero], kind='stable')]
+            facets[facet] = [{'value': values[facet][i], 'count': int(counts[i])} for i in top]
+        return facets
+
+def _mask(doc_ids, article_ids):
+    # 0/1 vector over indexed documents; ids not (yet) in the index are ignored
+    mask = np.zeros(len(doc_ids), dtype=bool)
+    article_ids = np.asarray(article_ids, dtype=np.int64)
+    if len(doc_ids) == 0 or len(article_ids) == 0:
+        return mask
+    positions = np.searchsorted(doc_ids, article_ids)
+    in_range = positions < len(doc_ids)
+    positions, article_ids = positions[in_range], article_ids[in_range]
+    mask[positions[doc_ids[positions] == article_ids]] = True
+    return mask
+
+facet_index = FacetIndex()
+
+def get_facet_index(article_ids=()):
+    # Results newer than the index (ingested since the last refresh, possibly by
+    # another worker) trigger a refresh so they're counted
+    stale = time.monotonic() - facet_index.last_refresh > REFRESH_INTERVAL
+    if stale or (article_ids and max(article_ids) > facet_index.last_article_id):
+        facet_index.refresh()
+    return facet_index
@@ -0,0 +1,102 @@
+import re
+import logging
+from models import db, Article
+from services.text_store import load_text
+
+logger = logging.getLogger(__name__)
+
+# Full text lives compressed in text_blob, so matching uses the database's own
+# full-text index instead: a contentless FTS5 table on SQLite (the index only,
+# not a second copy of the text) and a GIN-indexed tsvector table on PostgreSQL.
+CREATE_STATEMENTS = {
+    'sqlite': [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS article_fts USING fts5(full_text, content='', tokenize='porter unicode61')"
+    ],
+    'postgresql': [
+        "CREATE TABLE IF NOT EXISTS article_fts ("
+        "article_id INTEGER PRIMARY KEY REFERENCES article (id), document TSVECTOR NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS ix_article_fts_document ON article_fts USING GIN (document)"
+    ]
+}
+BACKFILL_BATCH_SIZE = 500
+
+_TOKEN = re.compile(r'\w+')
+_ready = set()
+
+def _dialect():
+    return db.session.get_bind().dialect.name
+
+def ensure_fulltext_table():
+    """Create the index table if the migration hasn't (e.g. databases made with create_all).
+
+    Returns False on databases without a supported full-text index.
+    """
+    dialect = _dialect()
+    if dialect not in CREATE_STATEMENTS:
+        return False
+    url = str(db.session.get_bind().url)
+    if url not in _ready:
+        for statement in CREATE_STATEMENTS[dialect]:
+            db.session.execute(db.text(statement))
+        _ready.add(url)
+    return True
+
+def index_full_text(article_id, text):
+    if not text or not ensure_fulltext_table():
+        return
+    if _dialect() == 'sqlite':
+        # Contentless FTS5 rows can't be replaced, and an article's full text doesn't change
+        exists = db.session.execute(
+            db.text("SELECT 1 FROM article_fts WHERE rowid = :id"), {'id': article_id}
+        ).first()
+        if not exists:
+            db.session.execute(
+                db.text("INSERT INTO article_fts (rowid, full_text) VALUES (:id, :text)"),
+                {'id': article_id, 'text': text}
+            )
+    else:
+        db.session.execute(
+            db.text(
+                "INSERT INTO article_fts (article_id, document) VALUES (:id, to_tsvector('english', :text)) "
+                "ON CONFLICT (article_id) DO UPDATE SET document = EXCLUDED.document"
+            ),
+            {'id': article_id, 'text': text}
+        )
+
+def full_text_match(query):
+    """A filter on Article.id for articles whose full text contains all query words, or None."""
+    tokens = _TOKEN.findall(query or '')
+    if not tokens or not ensure_fulltext_table():
+        return None
+    if _dialect() == 'sqlite':
+        # Quoted tokens are matched literally and ANDed, so user input can't form FTS5 syntax
+        matching = db.text("SELECT rowid FROM article_fts WHERE article_fts MATCH :match").bindparams(
+            match=' '.join(f'"{token}"' for token in tokens)
+        ).columns(db.column('rowid', db.Integer))
+    else:
+        matching = db.text(
+            "SELECT article_id FROM article_fts WHERE document @@ plainto_tsquery('english', :query)"
+        ).bindparams(query=' '.join(tokens)).columns(db.column('article_id', db.Integer))
+    return Article.id.in_(matching)
+
+def index_existing_articles():
+    # Backfill articles whose full text was stored before the index existed
+    if not ensure_fulltext_table():
+        return 0
+    id_column = 'rowid' if _dialect() == 'sqlite' else 'article_id'
+    indexed = {row[0] for row in db.session.execute(db.text(f"SELECT {id_column} FROM article_fts"))}
+    pending = [
+        article_id for (article_id,) in
+        db.session.query(Article.id).filter(Article.full_text_hash.isnot(None)).order_by(Article.id)
+        if article_id not in indexed
+    ]
+
+    for start in range(0, len(pending), BACKFILL_BATCH_SIZE):
+        rows = (
+            db.session.query(Article.id, Article.full_text_hash)
+            .filter(Article.id.in_(pending[start:start + BACKFILL_BATCH_SIZE])).all()
+        )
+        for article_id, content_hash in rows:
+            index_full_text(article_id, load_text(content_hash))
+        db.session.commit()
+    return len(pending)
@@ -0,0 +1,118 @@
+import os
+import shutil
+import logging
+import tempfile
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from urllib.parse import urlparse
+import requests
+from pypdf import PdfReader
+from services.text_store import encode_text
+
+logger = logging.getLogger(__name__)
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+_extract_pool = None
+_extract_pool_lock = threading.Lock()
+
+def get_extract_pool(max_workers=None):
+    """Long-lived extraction pool shared by all ingests in this process.
+
+    Workers are spawned rather than forked: the web process may already run
+    torch or model threads, and forking after threads start can deadlock.
+    """
+    global _extract_pool
+    with _extract_pool_lock:
+        if _extract_pool is None or getattr(_extract_pool, '_broken', False):
+            _extract_pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'))
+        return _extract_pool
+
+def pdf_location(arxiv_id, base_url):
+    # base_url is either an http(s) URL, a file:// URL or a plain local directory
+    filename = f"{arxiv_id}.pdf"
+    parsed = urlparse(base_url)
+    if parsed.scheme in ('http', 'https'):
+        return f"{base_url.rstrip('/')}/{filename}"
+    directory = parsed.path if parsed.scheme == 'file' else base_url
+    return os.path.join(directory, filename)
+
+def download_pdf(arxiv_id, base_url, dest_dir, timeout=60):
+    location = pdf_location(arxiv_id, base_url)
+    dest_path = os.path.join(dest_dir, f"{arxiv_id.replace('/', '_')}.pdf")
+
+    # Copy in fixed-size chunks so a large PDF is never held in memory
+    if location.startswith(('http://', 'https://')):
+        with requests.get(location, stream=True, timeout=timeout) as response:
+            response.raise_for_status()
+            with open(dest_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+    else:
+        with open(location, 'rb') as src, open(dest_path, 'wb') as f:
+            shutil.copyfileobj(src, f, DOWNLOAD_CHUNK_SIZE)
+
+    return dest_path
+
+def extract_pdf_text(path):
+    # Runs in a worker process. Pages are parsed one at a time from the open file
+    # and the text is compressed here, so only the compressed bytes cross back.
+    pages = []
+    with open(path, 'rb') as f:
+        reader = PdfReader(f)
+        for page in reader.pages:
+            page_text = page.extract_text() or ''
+            if page_text.strip():
+                pages.append(page_text)
+
+    text = '\n\n'.join(pages)
+    if not text:
+        return None
+
+    return encode_text(text)
+
+def fetch_full_texts(arxiv_ids, base_url, download_concurrency=8, extract_workers=None):
+    """Download and extract the PDFs for arxiv_ids.
+
+    Returns a dict of arxiv_id -> encoded text (see text_store.encode_text);
+    papers whose PDF can't be fetched or parsed are left out.
+    """
+    results = {}
+    if not arxiv_ids:
+        return results
+
+    extractors = get_extract_pool(extract_workers)
+    with tempfile.TemporaryDirectory(prefix='pofactam-pdf-') as tmp_dir, \
+            ThreadPoolExecutor(max_workers=download_concurrency) as downloads:
+
+        download_futures = {
+            downloads.submit(download_pdf, arxiv_id, base_url, tmp_dir): arxiv_id
+            for arxiv_id in arxiv_ids
+        }
+
+        # Extraction of a paper starts as soon as its download finishes
+        extract_futures = {}
+        for future in as_completed(download_futures):
+            arxiv_id = download_futures[future]
+            try:
+                path = future.result()
+            except Exception as e:
+                logger.warning(f"Could not download PDF for {arxiv_id}: {e}")
+                continue
+            extract_futures[extractors.submit(extract_pdf_text, path)] = (arxiv_id, path)
+
+        for future in as_completed(extract_futures):
+            arxiv_id, path = extract_futures[future]
+            try:
+                encoded = future.result()
+            except Exception as e:
+                logger.warning(f"Could not extract text from PDF for {arxiv_id}: {e}")
+                continue
+            finally:
+                os.remove(path)
+            if encoded:
+                results[arxiv_id] = encoded
+
+    logger.info(f"Extracted full text for {len(results)} of {len(arxiv_ids)} papers")
+    return results
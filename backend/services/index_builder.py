@@ -0,0 +1,107 @@
+import logging
+import numpy as np
+from scipy.sparse import csr_matrix, diags
+from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer
+from sklearn.preprocessing import normalize
+from models import db, Article
+from services.index_store import publish_index
+from services.search_service import tokenize_text
+from ml.recommendation import encode_abstracts, embedders
+
+logger = logging.getLogger(__name__)
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+LOAD_BATCH_SIZE = 5000
+
+def _corpus():
+    rows = (
+        db.session.query(Article.id, Article.title, Article.abstract)
+        .filter(Article.duplicate_of_id.is_(None))
+        .order_by(Article.id)
+        .yield_per(LOAD_BATCH_SIZE)
+    )
+    ids, titles, abstracts = [], [], []
+    for article_id, title, abstract in rows:
+        ids.append(article_id)
+        titles.append(title)
+        abstracts.append(abstract or '')
+    return np.array(ids, dtype=np.int64), titles, abstracts
+
+def tfidf_arrays(abstracts):
+    vectorizer = TfidfVectorizer(stop_words='english', dtype=np.float32)
+    matrix = vectorizer.fit_transform(abstracts)
+    return matrix, vectorizer.get_feature_names_out(), vectorizer.idf_.astype(np.float32)
+
+def tfidf_transform(abstracts, terms, idf):
+    # Vectorize with a published index's vocabulary and idf, so rows line up with
+    # the index matrix; words the index hasn't seen are dropped until the next build
+    vectorizer = CountVectorizer(stop_words='english', vocabulary=list(terms), dtype=np.float32)
+    matrix = vectorizer.transform(abstracts) @ diags(np.asarray(idf, dtype=np.float32))
+    return normalize(matrix).tocsr()
+
+def build_tfidf_index():
+    ids, _, abstracts = _corpus()
+    matrix, terms, idf = tfidf_arrays(abstracts)
+    # get_feature_names_out is sorted, so terms can be looked up with searchsorted on the mapped array
+    return publish_index('tfidf', {'ids': ids, 'terms': terms.astype(str), 'idf': idf}, sparse={'matrix': matrix})
+
+def bm25_arrays(titles, abstracts):
+    docs = [tokenize_text(f"{title} {abstract}") for title, abstract in zip(titles, abstracts)]
+    terms = np.array(sorted({token for doc in docs for token in doc}), dtype=str)
+
+    rows, cols, counts = [], [], []
+    for row, doc in enumerate(docs):
+        if not doc:
+            continue
+        columns, tf = np.unique(np.searchsorted(terms, doc), return_counts=True)
+        rows.extend([row] * len(columns))
+        cols.extend(columns)
+        counts.extend(tf)
+
+    tf_matrix = csr_matrix(
+        (np.array(counts, dtype=np.float32), (rows, cols)),
+        shape=(len(docs), len(terms))
+    )
+    doc_lengths = np.array([len(doc) for doc in docs], dtype=np.float32)
+    doc_freq = np.bincount(np.array(cols, dtype=np.int64), minlength=len(terms)).astype(np.float32)
+    # Same idf as rank_bm25's BM25Okapi, without its epsilon floor for very common terms
+    idf = np.log((len(docs) - doc_freq + 0.5) / (doc_freq + 0.5) + 1).astype(np.float32)
+    return tf_matrix, terms, doc_lengths, idf
+
+def build_bm25_index():
+    ids, titles, abstracts = _corpus()
+    tf_matrix, terms, doc_lengths, idf = bm25_arrays(titles, abstracts)
+    return publish_index(
+        'bm25',
+        {'ids': ids, 'terms': terms, 'doc_lengths': doc_lengths, 'idf': idf},
+        sparse={'tf': tf_matrix},
+        metadata={
+            'avgdl': float(doc_lengths.mean()) if len(doc_lengths) else 0.0,
+            'k1': BM25_K1,
+            'b': BM25_B
+        }
+    )
+
+def build_embedding_index():
+    ids, _, abstracts = _corpus()
+    embeddings = np.asarray(encode_abstracts(abstracts), dtype=np.float32)
+    # Vectors from different embedders can't be mixed; readers check this before using the index
+    metadata = {
+        'backend': embedders.selected(),
+        'dimension': int(embeddings.shape[1]) if embeddings.ndim == 2 else 0
+    }
+    return publish_index('embeddings', {'ids': ids, 'embeddings': embeddings}, metadata=metadata)
+
+BUILDERS = {
+    'tfidf': build_tfidf_index,
+    'bm25': build_bm25_index,
+    'embeddings': build_embedding_index
+}
+
+def build_indexes(names=None):
+    versions = {}
+    for name in names or BUILDERS:
+        versions[name] = BUILDERS[name]()
+        logger.info(f"Published {name} index version {versions[name]}")
+    return versions
@@ -0,0 +1,167 @@
+import os
+import json
+import time
+import shutil
+import threading
+from datetime import datetime
+import numpy as np
+from scipy.sparse import csr_matrix
+from flask import current_app
+
+MANIFEST = 'manifest.json'
+CURRENT = 'CURRENT'
+VERSION_FORMAT = '%Y%m%dT%H%M%S%f'
+FORMAT_VERSION = 1
+# Older versions kept on disk; workers that still map them keep working since unlinked files stay mapped
+KEEP_VERSIONS = 3
+# How often a worker stats the CURRENT pointer for a newer version
+CHECK_INTERVAL = 1.0
+
+def _index_root():
+    return current_app.config['INDEX_DIR']
+
+def publish_version(parent_dir, write):
+    """Write a new version directory under parent_dir and atomically make it current.
+
+    write(tmp_dir, version) fills a private temporary directory; readers only
+    ever see complete versions through the CURRENT pointer.
+    """
+    os.makedirs(parent_dir, exist_ok=True)
+
+    version = datetime.utcnow().strftime(VERSION_FORMAT)
+    tmp_dir = os.path.join(parent_dir, f".tmp-{version}-{os.getpid()}")
+    os.makedirs(tmp_dir)
+    try:
+        write(tmp_dir, version)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    # The version directory appears complete or not at all, then the pointer is swapped
+    os.rename(tmp_dir, os.path.join(parent_dir, version))
+    pointer_tmp = os.path.join(parent_dir, f".{CURRENT}.{os.getpid()}")
+    with open(pointer_tmp, 'w') as f:
+        f.write(version)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(pointer_tmp, os.path.join(parent_dir, CURRENT))
+
+    _remove_old_versions(parent_dir)
+    return version
+
+def current_version(parent_dir):
+    """Path of the version CURRENT points at, or None if nothing was published."""
+    try:
+        with open(os.path.join(parent_dir, CURRENT)) as f:
+            return os.path.join(parent_dir, f.read().strip())
+    except FileNotFoundError:
+        return None
+
+def publish_index(name, arrays, sparse=None, metadata=None, root=None):
+    """Write a new version of an index and atomically make it current.
+
+    arrays: dict of name -> numpy array, saved as .npy files.
+    sparse: dict of name -> scipy CSR matrix, saved as data/indices/indptr arrays.
+    """
+    def write(tmp_dir, version):
+        manifest = {
+            'format': FORMAT_VERSION,
+            'name': name,
+            'version': version,
+            'created_at': datetime.utcnow().isoformat(),
+            'arrays': {},
+            'sparse': {},
+            'metadata': metadata or {}
+        }
+
+        def save(array_name, array):
+            array = np.ascontiguousarray(array)
+            np.save(os.path.join(tmp_dir, f"{array_name}.npy"), array, allow_pickle=False)
+            manifest['arrays'][array_name] = {'dtype': str(array.dtype), 'shape': list(array.shape)}
+
+        for array_name, array in (arrays or {}).items():
+            save(array_name, array)
+        for matrix_name, matrix in (sparse or {}).items():
+            matrix = csr_matrix(matrix)
+            matrix.sort_indices()
+            save(f"{matrix_name}.data", matrix.data)
+            save(f"{matrix_name}.indices", matrix.indices)
+            save(f"{matrix_name}.indptr", matrix.indptr)
+            manifest['sparse'][matrix_name] = {'shape': list(matrix.shape)}
+
+        with open(os.path.join(tmp_dir, MANIFEST), 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+    return publish_version(os.path.join(root or _index_root(), name), write)
+
+def _is_version(index_dir, entry):
+    if not os.path.isdir(os.path.join(index_dir, entry)):
+        return False
+    try:
+        datetime.strptime(entry, VERSION_FORMAT)
+    except ValueError:
+        return False
+    return True
+
+def _remove_old_versions(index_dir):
+    # Only version directories are pruned; anything else sharing the directory is left alone
+    versions = sorted(entry for entry in os.listdir(index_dir) if _is_version(index_dir, entry))
+    for version in versions[:-KEEP_VERSIONS]:
+        shutil.rmtree(os.path.join(index_dir, version), ignore_errors=True)
+
+class MappedIndex:
+    """A read-only view of one index version; arrays are memory-mapped, not copied."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, MANIFEST)) as f:
+            self.manifest = json.load(f)
+        self.version = self.manifest['version']
+        self.metadata = self.manifest['metadata']
+        self._arrays = {
+            array_name: np.load(os.path.join(path, f"{array_name}.npy"), mmap_mode='r', allow_pickle=False)
+            for array_name in self.manifest['arrays']
+        }
+
+    def array(self, name):
+        return self._arrays[name]
+
+    def sparse(self, name):
+        shape = tuple(self.manifest['sparse'][name]['shape'])
+        return csr_matrix(
+            (self._arrays[f"{name}.data"], self._arrays[f"{name}.indices"], self._arrays[f"{name}.indptr"]),
+            shape=shape,
+            copy=False
+        )
+
+class IndexStore:
+    """Per-process cache of mapped indexes that follows the CURRENT pointer."""
+
+    def __init__(self):
+        self._indexes = {}  # name -> (MappedIndex, last check time)
+        self._lock = threading.Lock()
+
+    def get(self, name, root=None):
+        index_dir = os.path.join(root or _index_root(), name)
+        now = time.monotonic()
+        cached = self._indexes.get(name)
+        if cached and now - cached[1] < CHECK_INTERVAL:
+            return cached[0]
+
+        with self._lock:
+            try:
+                with open(os.path.join(index_dir, CURRENT)) as f:
+                    version = f.read().strip()
+            except FileNotFoundError:
+                return None
+
+            index = cached[0] if cached else None
+            if index is None or index.version != version:
+                index = MappedIndex(os.path.join(index_dir, version))
+            self._indexes[name] = (index, now)
+            return index
+
+index_store = IndexStore()
+
+def get_index(name):
+    return index_store.get(name)
@@ -0,0 +1,120 @@
+import logging
+from datetime import datetime
+from flask import current_app
+from models import db, Article
+from nlp.summarizer import summarize_document
+from ml.topic_model import update_topic_model
+from services.suggest_index import refresh_suggest_index
+from services.fulltext_service import fetch_full_texts
+from services.text_store import store_encoded_text, decompress_text
+from services.fulltext_search import index_full_text
+from services.alert_service import match_saved_searches
+from services.citation_service import extract_references, add_citations, link_new_articles, update_citation_scores
+from services.dedupe_service import split_arxiv_version, paper_signature, find_near_duplicate, index_signature
+
+logger = logging.getLogger(__name__)
+
+def ingest_papers(papers):
+    # Versions of a paper share the arXiv id without its 'vN' suffix
+    versions = [split_arxiv_version(paper['arxiv_id']) for paper in papers]
+    by_base_id = {
+        article.arxiv_base_id: article for article in
+        Article.query.filter(Article.arxiv_base_id.in_({base_id for base_id, _ in versions})).all()
+    }
+
+    new_articles = []
+    updated_articles = []
+    duplicates = []
+    for paper, (base_id, version) in zip(papers, versions):
+        existing = by_base_id.get(base_id)
+        if existing:
+            if (version or 0) > (existing.arxiv_version or 0):
+                merge_version(existing, paper, version)
+                updated_articles.append(existing)
+            continue
+
+        article = Article(
+            title=paper['title'],
+            authors=', '.join(paper['authors']),
+            abstract=paper['abstract'],
+            arxiv_id=paper['arxiv_id'],
+            arxiv_base_id=base_id,
+            arxiv_version=version,
+            categories=' '.join(paper.get('categories') or []),
+            publication_date=paper['publication_date']
+        )
+        db.session.add(article)
+        by_base_id[base_id] = article
+
+        # Near-identical papers (cross-lists, re-submissions) are linked to the
+        # earlier copy and skip full-text extraction and summarization
+        signature = paper_signature(article.title, article.abstract)
+        match = find_near_duplicate(signature)
+        if match:
+            article.duplicate_of_id = match[0]
+            duplicates.append(article)
+            logger.debug(f"Linked {article.arxiv_id} as near-duplicate of article {match[0]} (similarity {match[1]:.2f})")
+            continue
+
+        index_signature(article, signature)
+        new_articles.append(article)
+        logger.debug(f"Added new paper: {article.title}")
+
+    logger.info(f"Linked {len(duplicates)} near-duplicate papers")
+
+    # Full-text stage: download and extract PDFs for the whole batch concurrently.
+    # An empty ARXIV_PDF_BASE_URL turns it off and summaries come from abstracts.
+    full_texts = {}
+    if current_app.config['ARXIV_PDF_BASE_URL']:
+        full_texts = fetch_full_texts(
+            [article.arxiv_id for article in new_articles],
+            base_url=current_app.config['ARXIV_PDF_BASE_URL'],
+            download_concurrency=current_app.config['FULLTEXT_DOWNLOAD_CONCURRENCY'],
+            extract_workers=current_app.config['FULLTEXT_EXTRACT_WORKERS']
+        )
+
+    db.session.flush()
+    references = {}
+    for article in new_articles:
+        encoded = full_texts.get(article.arxiv_id)
+        if encoded:
+            article.full_text_blob = store_encoded_text(encoded)
+            text = decompress_text(encoded['codec'], encoded['data'])
+            references[article.id] = extract_references(text)
+            index_full_text(article.id, text)
+        else:
+            # No PDF available, summarize the abstract instead
+            text = article.abstract
+
+        article.summary = summarize_document(text)
+        logger.debug(f"Generated summary for paper: {article.title}")
+
+    # Citation graph: resolve this batch's references, then re-rank with warm-started PageRank
+    link_new_articles(new_articles + duplicates)
+    citation_count = add_citations(references)
+    db.session.flush()
+    update_citation_scores()
+    logger.info(f"Added {citation_count} citations")
+
+    match_saved_searches(new_articles)
+
+    logger.info(f"Committing {len(new_articles)} new papers to database")
+    db.session.commit()
+
+    if new_articles:
+        update_topic_model(new_articles)
+    if new_articles or updated_articles:
+        refresh_suggest_index()
+
+    return new_articles
+
+def merge_version(article, paper, version):
+    # A newer version replaces the stored metadata in place instead of adding a row
+    logger.debug(f"Updating {article.arxiv_id} to {paper['arxiv_id']}")
+    article.arxiv_id = paper['arxiv_id']
+    article.arxiv_version = version
+    article.title = paper['title']
+    article.authors = ', '.join(paper['authors'])
+    article.abstract = paper['abstract']
+    article.categories = ' '.join(paper.get('categories') or []) or article.categories
+    article.updated_at = datetime.utcnow()
@@ -1,18 +1,128 @@
-import arxiv
 from rank_bm25 import BM25Okapi
 from nltk.tokenize import word_tokenize
 from nltk.corpus import stopwords
 import numpy as np
+from datetime import timedelta
+from dateutil.parser import parse
+from models import db, Article
+from services.index_store import get_index
+from services.fulltext_search import full_text_match
 
 stop_words = set(stopwords.words('english'))
 
+def tokenize_text(text):
+    return [word.lower() for word in word_tokenize(text) if word.lower() not in stop_words]
+
+def rank_articles(query, articles):
+    # BM25 over the shared, memory-mapped corpus statistics; articles indexed after
+    # the last build keep their place at the end of the list
+    index = get_index('bm25')
+    if index is None or not query or not articles:
+        return articles
+
+    ids = index.array('ids')
+    terms = index.array('terms')
+    query_tokens = np.array(sorted(set(tokenize_text(query))), dtype=str)
+    if len(ids) == 0 or len(terms) == 0 or len(query_tokens) == 0:
+        return articles
+
+    article_ids = np.array([article.id for article in articles], dtype=np.int64)
+    rows = np.minimum(np.searchsorted(ids, article_ids), len(ids) - 1)
+    indexed = ids[rows] == article_ids
+    columns = np.minimum(np.searchsorted(terms, query_tokens), len(terms) - 1)
+    columns = columns[terms[columns] == query_tokens]
+
+    scores = np.full(len(articles), -1.0)
+    if len(columns):
+        k1, b, avgdl = index.metadata['k1'], index.metadata['b'], index.metadata['avgdl']
+        tf = index.sparse('tf')[rows[indexed]][:, columns].toarray()
+        doc_lengths = np.asarray(index.array('doc_lengths'))[rows[indexed]][:, None]
+        idf = np.asarray(index.array('idf'))[columns]
+        weights = tf * (k1 + 1) / (tf + k1 * (1 - b + b * doc_lengths / avgdl))
+        scores[indexed] = weights @ idf
+
+    order = np.argsort(-scores, kind='stable')
+    return [articles[i] for i in order]
+
+def _parse_date(value):
+    # Midnight at the start of the given day, naive like the stored publication dates
+    if not value:
+        return None
+    return parse(value).replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+
+def _parse_bool(value):
+    if value is None or isinstance(value, bool):
+        return value
+    value = str(value).strip().lower()
+    if value in ('true', '1', 'yes'):
+        return True
+    if value in ('false', '0', 'no'):
+        return False
+    return None
+
+def _like_escape(value):
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+def parse_filters(data):
+    # Request filters use the same camelCase names as the article JSON; dates are whole days
+    data = data or {}
+    return {
+        'date_from': _parse_date(data.get('dateFrom')),
+        'date_to': _parse_date(data.get('dateTo')),
+        'authors': [author for author in data.get('authors') or [] if author],
+        'categories': [category for category in data.get('categories') or [] if category],
+        'favorite': _parse_bool(data.get('favorite'))
+    }
+
+def build_article_query(query, filters=None):
+    filters = filters or {}
+    articles = Article.query.filter(Article.duplicate_of_id.is_(None))
+
+    if query:
+        conditions = [Article.title.ilike(f'%{query}%'), Article.abstract.ilike(f'%{query}%')]
+        in_full_text = full_text_match(query)
+        if in_full_text is not None:
+            conditions.append(in_full_text)
+        articles = articles.filter(db.or_(*conditions))
+    if filters.get('date_from'):
+        articles = articles.filter(Article.publication_date >= filters['date_from'])
+    if filters.get('date_to'):
+        # dateTo includes the whole day
+        articles = articles.filter(Article.publication_date < filters['date_to'] + timedelta(days=1))
+    if filters.get('authors'):
+        # Exact names, split on ', ' like the author facet, so 'Jane Doe' doesn't match 'Jane Doey'
+        padded = db.literal(', ').concat(Article.authors).concat(', ')
+        articles = articles.filter(db.or_(*[
+            padded.like(f'%, {_like_escape(author)}, %', escape='\\') for author in filters['authors']
+        ]))
+    if filters.get('categories'):
+        # Categories are space separated; pad them so 'cs.L' doesn't match 'cs.LG'
+        padded = db.literal(' ').concat(Article.categories).concat(' ')
+        articles = articles.filter(db.or_(*[padded.like(f'% {category} %') for category in filters['categories']]))
+    if filters.get('favorite') is not None:
+        articles = articles.filter(db.func.coalesce(Article.is_favorite, False) == bool(filters['favorite']))
+
+    return articles
+
+def _arxiv_query(query, filters):
+    parts = [f'({query})'] if query else []
+    if filters.get('authors'):
+        parts.append('(' + ' OR '.join(f'au:"{author}"' for author in filters['authors']) + ')')
+    if filters.get('categories'):
+        parts.append('(' + ' OR '.join(f'cat:{category}' for category in filters['categories']) + ')')
+    return ' AND '.join(parts)
+
 def search_articles(query, filters=None, max_results=50):
+    # Imported here so the local ranking above works without the arXiv client installed
+    import arxiv
+    filters = filters or {}
+
     # Create a client with the default configuration
     client = arxiv.Client()
 
     # Prepare the search query
     search = arxiv.Search(
-        query=query,
+        query=_arxiv_query(query, filters),
         max_results=max_results * 2,  # Fetch more results for re-ranking
         sort_by=arxiv.SortCriterion.Relevance,
         sort_order=arxiv.SortOrder.Descending,
@@ -24,6 +134,13 @@ def search_articles(query, filters=None, max_results=50):
     # Process the results
     articles = []
     for result in results:
+        # The arXiv API has no date range parameter, so dates are filtered here
+        published = result.published.replace(tzinfo=None)
+        if filters.get('date_from') and published < filters['date_from']:
+            continue
+        if filters.get('date_to') and published >= filters['date_to'] + timedelta(days=1):
+            continue
+
         article = {
             'id': result.entry_id,
             'title': result.title,
@@ -31,12 +148,13 @@ def search_articles(query, filters=None, max_results=50):
             'abstract': result.summary,
             'publicationDate': result.published.strftime("%Y-%m-%d"),
             'url': result.pdf_url,
+            'categories': result.categories,
         }
         articles.append(article)
 
     # Re-rank articles using BM25
-    tokenized_query = [word.lower() for word in word_tokenize(query) if word.lower() not in stop_words]
-    tokenized_corpus = [[word.lower() for word in word_tokenize(doc['title'] + ' ' + doc['abstract']) if word.lower() not in stop_words] for doc in articles]
+    tokenized_query = tokenize_text(query)
+    tokenized_corpus = [tokenize_text(doc['title'] + ' ' + doc['abstract']) for doc in articles]
 
     bm25 = BM25Okapi(tokenized_corpus)
     bm25_scores = bm25.get_scores(tokenized_query)
@@ -0,0 +1,225 @@
+import sys
+import time
+import heapq
+import threading
+from bisect import bisect_left
+from models import db, Article
+from nlp.keywords import extract_keywords
+
+# Longest prefix whose top suggestions are precomputed; longer prefixes match few enough keys to scan
+PRECOMPUTED_PREFIX_LENGTH = 2
+PRECOMPUTED_TOP_N = 10
+# Upper bound on indexed keys; the lowest-weighted keys are dropped beyond it
+MAX_KEYS = 200000
+FAVORITE_BOOST = 5.0
+REFRESH_INTERVAL = 30
+LOAD_BATCH_SIZE = 5000
+
+def normalize(text):
+    return ' '.join(text.lower().split())
+
+class PrefixIndex:
+    """Typeahead index over titles, author names and keywords.
+
+    Keys are kept in a sorted list so a prefix maps to a contiguous range found
+    with bisect. New articles are merged in without rebuilding the whole index.
+    """
+
+    def __init__(self):
+        self._keys = []
+        self._entries = {}  # key -> [display text, kind, weight]
+        self._top = {}  # short prefix -> precomputed [(weight, key)]
+        self._article_keys = {}  # article id -> keys it contributed, so a changed article can be taken out
+        self._lock = threading.Lock()
+        self.favorite_ids = set()  # articles whose terms currently carry FAVORITE_BOOST
+        self.last_article_id = 0
+        self.last_updated_at = None
+        self.last_refresh = 0.0
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _article_terms(self, title, authors, abstract):
+        # (key text, kind, display text)
+        yield title, 'title', title
+        for author in authors.split(', '):
+            yield author, 'author', author
+            # Also match on the last name; keyed by the full name too so namesakes stay separate
+            parts = author.split()
+            if len(parts) > 1:
+                yield f"{parts[-1]}\0{author}", 'author', author
+        for keyword in extract_keywords(f"{title} {abstract}"):
+            yield keyword, 'keyword', keyword
+
+    def _terms(self, title, authors, abstract):
+        # (key, display, kind) per term occurrence; keyword extraction runs outside the lock
+        terms = []
+        for text, kind, display in self._article_terms(title, authors, abstract):
+            key = normalize(text)
+            if key:
+                terms.append((sys.intern(key), display, kind))
+        return terms
+
+    def _weight(self, article_id):
+        return 1.0 + (FAVORITE_BOOST if article_id in self.favorite_ids else 0.0)
+
+    def _add(self, article_id, terms, new_keys, changed):
+        weight = self._weight(article_id)
+        for key, display, kind in terms:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._entries[key] = [display, kind, weight]
+                new_keys.add(key)
+            else:
+                entry[2] += weight
+            changed.add(key)
+        self._article_keys[article_id] = tuple(key for key, _, _ in terms)
+
+    def _remove(self, article_id, removed_keys, changed):
+        weight = self._weight(article_id)
+        for key in self._article_keys.pop(article_id, ()):
+            # Keys dropped by pruning stay dropped
+            entry = self._entries.get(key)
+            if entry is None:
+                continue
+            entry[2] -= weight
+            changed.add(key)
+            if entry[2] <= 0:
+                del self._entries[key]
+                removed_keys.add(key)
+
+    def _merge_keys(self, new_keys, removed_keys, changed):
+        if removed_keys:
+            self._keys = [key for key in self._keys if key not in removed_keys]
+        if new_keys:
+            self._keys = list(heapq.merge(self._keys, sorted(new_keys)))
+        if len(self._keys) > MAX_KEYS:
+            self._prune()
+            self._top = {}
+            changed = self._keys
+        self._refresh_top(changed)
+
+    def add_articles(self, rows):
+        """Index new articles, or re-index ones already indexed whose metadata changed.
+
+        rows: iterables of (id, title, authors, abstract, is_favorite).
+        """
+        articles = [
+            (article_id, is_favorite, self._terms(title, authors, abstract))
+            for article_id, title, authors, abstract, is_favorite in rows
+        ]
+
+        new_keys = set()
+        removed_keys = set()
+        changed = set()
+        with self._lock:
+            for article_id, is_favorite, terms in articles:
+                if article_id in self._article_keys:
+                    self._remove(article_id, removed_keys, changed)
+                if is_favorite:
+                    self.favorite_ids.add(article_id)
+                self._add(article_id, terms, new_keys, changed)
+                self.last_article_id = max(self.last_article_id, article_id)
+            # A key removed and added back in the same batch never left _keys
+            readded = removed_keys & self._entries.keys()
+            removed_keys -= readded
+            new_keys -= readded
+            self._merge_keys(new_keys, removed_keys, changed)
+
+    def update_favorites(self, favorite_ids):
+        """Move the favorite boost to the current favorites."""
+        changed = set()
+        with self._lock:
+            for article_id in favorite_ids ^ self.favorite_ids:
+                delta = FAVORITE_BOOST if article_id in favorite_ids else -FAVORITE_BOOST
+                for key in self._article_keys.get(article_id, ()):
+                    entry = self._entries.get(key)
+                    if entry is not None:
+                        entry[2] += delta
+                        changed.add(key)
+            self.favorite_ids = set(favorite_ids)
+            self._refresh_top(changed)
+
+    def _prune(self):
+        keep = sorted(self._keys, key=lambda key: self._entries[key][2], reverse=True)[:MAX_KEYS]
+        for key in set(self._keys) - set(keep):
+            del self._entries[key]
+        self._keys = sorted(keep)
+
+    def _refresh_top(self, changed_keys):
+        prefixes = {key[:length] for key in changed_keys for length in range(1, PRECOMPUTED_PREFIX_LENGTH + 1)}
+        for prefix in prefixes:
+            self._top[prefix] = self._scan(prefix, PRECOMPUTED_TOP_N)
+
+    def _range(self, prefix):
+        return bisect_left(self._keys, prefix), bisect_left(self._keys, prefix + '\uffff')
+
+    def _scan(self, prefix, limit):
+        lo, hi = self._range(prefix)
+        return heapq.nlargest(limit, ((self._entries[key][2], key) for key in self._keys[lo:hi]))
+
+    def suggest(self, prefix, limit=10):
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        # Refreshes replace _keys and prune _entries, so reads take the lock too
+        with self._lock:
+            if len(prefix) <= PRECOMPUTED_PREFIX_LENGTH and limit <= PRECOMPUTED_TOP_N:
+                top = self._top.get(prefix, [])[:limit]
+            else:
+                top = self._scan(prefix, limit)
+
+            suggestions = []
+            for weight, key in top:
+                display, kind, _ = self._entries[key]
+                suggestions.append({'text': display, 'type': kind, 'weight': weight})
+        return suggestions
+
+def _article_rows(min_id=0):
+    return (
+        db.session.query(Article.id, Article.title, Article.authors, Article.abstract, Article.is_favorite)
+        .filter(Article.id > min_id, Article.duplicate_of_id.is_(None))
+        .order_by(Article.id)
+        .yield_per(LOAD_BATCH_SIZE)
+    )
+
+def _updated_rows(max_id, updated_after):
+    # Indexed articles whose metadata a newer arXiv version replaced since the last refresh
+    query = (
+        db.session.query(Article.id, Article.title, Article.authors, Article.abstract, Article.is_favorite)
+        .filter(Article.id <= max_id, Article.duplicate_of_id.is_(None), Article.updated_at.isnot(None))
+        .order_by(Article.id)
+    )
+    if updated_after is not None:
+        query = query.filter(Article.updated_at > updated_after)
+    return query.yield_per(LOAD_BATCH_SIZE)
+
+suggest_index = PrefixIndex()
+
+def get_suggest_index():
+    # Each worker keeps its own copy and periodically picks up articles ingested elsewhere
+    if time.monotonic() - suggest_index.last_refresh > REFRESH_INTERVAL:
+        refresh_suggest_index()
+    return suggest_index
+
+def refresh_suggest_index():
+    # Only new and updated articles are read, so this is cheap after the first load
+    suggest_index.last_refresh = time.monotonic()
+    # Taken before reading so an update committed meanwhile is picked up next time
+    last_updated_at = db.session.query(db.func.max(Article.updated_at)).scalar()
+    indexed_id = suggest_index.last_article_id
+    if indexed_id:
+        suggest_index.add_articles(_updated_rows(indexed_id, suggest_index.last_updated_at))
+    suggest_index.add_articles(_article_rows(indexed_id))
+    suggest_index.last_updated_at = last_updated_at
+
+    # Articles are favorited after ingest, so like facet_index the favorites are reloaded
+    # every time and the boost moved for the articles whose status changed
+    favorite_ids = {
+        article_id for (article_id,) in db.session.query(Article.id).filter(
+            Article.is_favorite.is_(True),
+            Article.duplicate_of_id.is_(None),
+            Article.id <= suggest_index.last_article_id
+        )
+    }
+    suggest_index.update_favorites(favorite_ids)
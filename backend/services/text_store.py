@@ -0,0 +1,63 @@
+import hashlib
+import zlib
+from models import db, TextBlob
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 10
+
+# zstd compresses text better and decompresses faster; zlib is always available
+DEFAULT_CODEC = 'zstd' if zstandard is not None else 'zlib'
+
+def content_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def compress_text(text, codec=DEFAULT_CODEC):
+    raw = text.encode('utf-8')
+    if codec == 'zstd':
+        return codec, zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    if codec == 'zlib':
+        return codec, zlib.compress(raw, ZLIB_LEVEL)
+    raise ValueError(f"Unknown text codec: {codec}")
+
+def decompress_text(codec, data):
+    if codec == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd-compressed text")
+        return zstandard.ZstdDecompressor().decompress(data).decode('utf-8')
+    if codec == 'zlib':
+        return zlib.decompress(data).decode('utf-8')
+    raise ValueError(f"Unknown text codec: {codec}")
+
+def encode_text(text, codec=DEFAULT_CODEC):
+    # Everything needed to persist a TextBlob; cheap to pickle back from worker processes
+    codec, data = compress_text(text, codec)
+    return {
+        'content_hash': content_hash(text),
+        'codec': codec,
+        'data': data,
+        'size': len(text)
+    }
+
+def store_encoded_text(encoded):
+    # Identical texts share one row, so re-ingesting the same PDF stores nothing new
+    blob = TextBlob.query.get(encoded['content_hash'])
+    if blob is None:
+        blob = TextBlob(**encoded)
+        db.session.add(blob)
+    return blob
+
+def store_text(text):
+    return store_encoded_text(encode_text(text))
+
+def load_text(text_hash):
+    if not text_hash:
+        return None
+    blob = TextBlob.query.get(text_hash)
+    if blob is None:
+        return None
+    return blob.text
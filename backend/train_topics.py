@@ -0,0 +1,13 @@
+from app import app
+from ml.topic_model import train_topic_model
+
+def train_topics():
+    with app.app_context():
+        lda = train_topic_model()
+        if lda is None:
+            print("Not enough articles with shared vocabulary to train a topic model.")
+        else:
+            print(f"Topic model trained with {lda.num_topics} topics.")
+
+if __name__ == "__main__":
+    train_topics()